@@ -0,0 +1,120 @@
+#!/usr/bin/env python3
+"""
+Analysis Helper Functions
+
+Shared driver for the analyze_*.py scripts. Fans per-file analysis out
+across CPU cores and folds the partial results back into one analyzer.
+
+Every analyzer class must provide:
+    analyze_data(data, root_key, default_path) - analyze a parsed document
+    analyze_file(filepath, root_key)           - analyze one file into self
+    merge(other)                               - fold another instance into self
+
+Usage:
+    from analysis_helpers import analyze_files, analyze_files_shared, child_path, PATH_CACHE
+"""
+
+import sys
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+from json_helpers import load_json, prefetch_files
+
+
+# Interned child paths keyed by (parent_path, key); key None means list items.
+# 5etools has a bounded key vocabulary, so nearly every lookup is a hit and
+# the walkers skip building and hashing a fresh path string per node.
+PATH_CACHE: Dict[Tuple[str, Optional[str]], str] = {}
+
+
+def child_path(path: str, key: Optional[str] = None) -> str:
+    """
+    Return the interned path of a dict child, or of list items if key is None.
+
+    Walkers should try PATH_CACHE.get((path, key)) inline first and only
+    call this on a miss.
+    """
+    cache_key = (path, key)
+    new_path = PATH_CACHE.get(cache_key)
+    if new_path is None:
+        if key is None:
+            new_path = f"{path}[]"
+        else:
+            new_path = f"{path}.{key}" if path else key
+        new_path = PATH_CACHE[cache_key] = sys.intern(new_path)
+    return new_path
+
+
+def _analyze_one(analyzer_cls, filepath: Path, root_key: str):
+    """Analyze a single file into a fresh analyzer (runs in a worker)."""
+    analyzer = analyzer_cls()
+    analyzer.analyze_file(filepath, root_key)
+    return analyzer
+
+
+def analyze_files(analyzer, files: List[Path], root_key: str = None):
+    """
+    Analyze files in parallel and merge the results into analyzer.
+
+    Partial results are merged in file order so the report matches a
+    sequential run as closely as possible.
+
+    Args:
+        analyzer: Analyzer instance to merge results into
+        files: JSON files to analyze
+        root_key: Top-level key holding the record list (e.g. 'monster')
+    """
+    if not files:
+        return
+
+    # Start disk readahead for every file up front so workers past the
+    # first batch don't stall on I/O
+    prefetch_files(files)
+
+    cls = type(analyzer)
+    with ProcessPoolExecutor() as executor:
+        futures = [executor.submit(_analyze_one, cls, path, root_key) for path in files]
+        for future in futures:
+            analyzer.merge(future.result())
+
+
+def _analyze_one_shared(analyzer_classes, filepath: Path, root_key: str):
+    """Parse a file once and run several fresh analyzers over it (runs in a worker)."""
+    print(f"  Analyzing {filepath.name}...")
+    analyzers = [cls() for cls in analyzer_classes]
+
+    try:
+        data = load_json(filepath)
+        for analyzer in analyzers:
+            analyzer.analyze_data(data, root_key, filepath.stem)
+    except Exception as e:
+        print(f"    ❌ Error: {e}")
+
+    return analyzers
+
+
+def analyze_files_shared(tasks: List[Tuple[Path, str, list]]):
+    """
+    Parse each file once and feed it to every analyzer that wants it.
+
+    Files are processed in parallel like analyze_files; each worker parses
+    its file a single time no matter how many analyzers consume it.
+
+    Args:
+        tasks: (filepath, root_key, analyzers) tuples; results are merged
+            into the given analyzer instances in task order
+    """
+    if not tasks:
+        return
+
+    prefetch_files(path for path, _, _ in tasks)
+
+    with ProcessPoolExecutor() as executor:
+        futures = [
+            executor.submit(_analyze_one_shared, [type(a) for a in analyzers], path, root_key)
+            for path, root_key, analyzers in tasks
+        ]
+        for (_, _, analyzers), future in zip(tasks, futures):
+            for analyzer, partial in zip(analyzers, future.result()):
+                analyzer.merge(partial)
@@ -0,0 +1,76 @@
+"""
+Run all four 5etools analyzers with a single parse per file.
+
+Each JSON file is parsed once and handed to every analyzer whose own
+script reads it, so the reports match running analyze_json_structure.py,
+analyze_field_types.py, analyze_controlled_vocab.py and
+analyze_relationships.py separately, at roughly a quarter of the parsing.
+"""
+
+from pathlib import Path
+
+import analyze_controlled_vocab
+import analyze_field_types
+import analyze_json_structure
+import analyze_relationships
+from analysis_helpers import analyze_files_shared
+from json_helpers import dump_json
+
+
+DATA_DIR = Path('/home/ctabone/dnd_bot/5etools-src-2.15.0/data')
+
+# Bestiary/spell files sampled by every analyzer except VocabAnalyzer,
+# which reads them all
+SAMPLED_FILES = 5
+
+
+def main():
+    """Main execution."""
+    print("=" * 60)
+    print("5etools Combined Analysis")
+    print("=" * 60)
+
+    structure = analyze_json_structure.StructureAnalyzer()
+    types = analyze_field_types.TypeAnalyzer()
+    vocab = analyze_controlled_vocab.VocabAnalyzer()
+    relationships = analyze_relationships.RelationshipAnalyzer()
+    all_analyzers = [structure, types, vocab, relationships]
+
+    tasks = []
+
+    # Items (items.json is only read by the structure and vocab scripts)
+    items_base = DATA_DIR / 'items-base.json'
+    if items_base.exists():
+        tasks.append((items_base, 'baseitem', all_analyzers))
+
+    items = DATA_DIR / 'items.json'
+    if items.exists():
+        tasks.append((items, 'item', [structure, vocab]))
+
+    # Monsters and spells
+    for dir_name, root_key in (('bestiary', 'monster'), ('spells', 'spell')):
+        data_dir = DATA_DIR / dir_name
+        if data_dir.exists():
+            for i, json_file in enumerate(sorted(data_dir.glob('*.json'))):
+                tasks.append((json_file, root_key, all_analyzers if i < SAMPLED_FILES else [vocab]))
+
+    print(f"\n📦 Analyzing {len(tasks)} files...")
+    analyze_files_shared(tasks)
+
+    # Generate reports
+    print("\n📊 Generating reports...")
+    reports = [
+        (analyze_json_structure.OUTPUT_FILE, analyze_json_structure.build_report(structure)),
+        (analyze_field_types.OUTPUT_FILE, analyze_field_types.build_report(types)),
+        (analyze_controlled_vocab.OUTPUT_FILE, vocab.to_dict()),
+        (analyze_relationships.OUTPUT_FILE, relationships.to_dict()),
+    ]
+
+    for output_file, report in reports:
+        output_file.parent.mkdir(parents=True, exist_ok=True)
+        dump_json(report, output_file)
+        print(f"✅ Report saved to: {output_file}")
+
+
+if __name__ == '__main__':
+    main()
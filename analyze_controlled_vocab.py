@@ -4,11 +4,13 @@ Extract controlled vocabulary (enum values) from 5etools JSON.
 Identifies fields with limited value sets that should become lookup tables.
 """
 
-import json
 from pathlib import Path
 from collections import Counter, defaultdict
 from typing import Any
 
+from json_helpers import load_json, dump_json
+from analysis_helpers import analyze_files, child_path, PATH_CACHE
+
 
 DATA_DIR = Path('/home/ctabone/dnd_bot/5etools-src-2.15.0/data')
 OUTPUT_FILE = Path('analysis/controlled_vocab.json')
@@ -17,64 +19,126 @@ OUTPUT_FILE = Path('analysis/controlled_vocab.json')
 class VocabAnalyzer:
     """Extracts controlled vocabulary from JSON."""
 
-    def __init__(self):
+    def __init__(self, max_unique_values: int = 100):
+        self.max_unique_values = max_unique_values
         self.field_values = defaultdict(Counter)
         self.field_total_count = defaultdict(int)
+        # Raw values seen since the last flush; counted in bulk by _flush_values
+        self._pending_values = defaultdict(list)
+        # Paths with more than max_unique_values distinct values (free text);
+        # their Counters are emptied and no longer updated
+        self._wide_fields = set()
 
     def extract_values(self, value: Any, path: str):
-        """Extract values for vocabulary analysis."""
-        self.field_total_count[path] += 1
-
-        # Only track simple scalar values and small strings
-        if isinstance(value, str):
-            # Track if it looks like a controlled value (short, alphanumeric)
-            if len(value) < 50 and not any(char in value for char in ['\n', '  ']):
-                self.field_values[path][value] += 1
-
-        elif isinstance(value, (int, float, bool)) and not isinstance(value, bool):
-            # Track numbers that might be enums
-            if isinstance(value, int) and -10 < value < 100:
-                self.field_values[path][value] += 1
-
-        elif isinstance(value, bool):
-            self.field_values[path][value] += 1
-
-        # Recurse
-        if isinstance(value, dict):
-            for key, val in value.items():
-                new_path = f"{path}.{key}" if path else key
-                self.extract_values(val, new_path)
-
-        elif isinstance(value, list):
-            for item in value:
-                new_path = f"{path}[]"
-                self.extract_values(item, new_path)
+        """Extract values for vocabulary analysis (iterative pre-order walk)."""
+        path_cache = PATH_CACHE
+        pending = self._pending_values
+        stack = [(value, path)]
+        while stack:
+            value, path = stack.pop()
+            self.field_total_count[path] += 1
+
+            # Parsed JSON only yields exact builtin types, so dispatch on
+            # type() identity; this also keeps bool apart from int
+            value_type = type(value)
+
+            # Only track simple scalar values and small strings
+            if value_type is str:
+                # Track if it looks like a controlled value (short, alphanumeric)
+                if len(value) < 50 and '\n' not in value and '  ' not in value:
+                    pending[path].append(value)
+
+            elif value_type is int:
+                # Track numbers that might be enums
+                if -10 < value < 100:
+                    pending[path].append(value)
+
+            elif value_type is bool:
+                pending[path].append(value)
+
+            # Push children in reverse so they pop in document order
+            elif value_type is dict:
+                stack.extend(reversed([
+                    (val, path_cache.get((path, key)) or child_path(path, key))
+                    for key, val in value.items()
+                ]))
+
+            elif value_type is list:
+                item_path = path_cache.get((path, None)) or child_path(path)
+                stack.extend((item, item_path) for item in reversed(value))
+
+    def analyze_data(self, data: Any, root_key: str = None, default_path: str = ''):
+        """Analyze an already-parsed JSON document."""
+        if root_key and root_key in data:
+            items = data[root_key]
+            if isinstance(items, list):
+                for item in items:
+                    self.extract_values(item, root_key)
+        else:
+            self.extract_values(data, default_path)
+
+        self._flush_values()
 
     def analyze_file(self, filepath: Path, root_key: str = None):
         """Analyze a single JSON file."""
         print(f"  Analyzing {filepath.name}...")
 
         try:
-            with open(filepath, 'r', encoding='utf-8') as f:
-                data = json.load(f)
-
-            if root_key and root_key in data:
-                items = data[root_key]
-                if isinstance(items, list):
-                    for item in items:
-                        self.extract_values(item, root_key)
-            else:
-                self.extract_values(data, filepath.stem)
+            self.analyze_data(load_json(filepath), root_key, filepath.stem)
 
         except Exception as e:
             print(f"    ❌ Error: {e}")
 
-    def identify_controlled_vocab(self, max_unique_values=100):
-        """Identify fields that are likely controlled vocabularies."""
+        self._flush_values()
+
+    def _flush_values(self):
+        """Fold pending raw values into field_values with one Counter.update per path."""
+        for path, values in self._pending_values.items():
+            if path not in self._wide_fields:
+                self._update_counts(path, values)
+        self._pending_values.clear()
+
+    def _update_counts(self, path: str, values):
+        """Count values for path, dropping the field once it is too wide to be a vocabulary."""
+        value_counts = self.field_values[path]
+        value_counts.update(values)
+        if len(value_counts) > self.max_unique_values:
+            value_counts.clear()
+            self._wide_fields.add(path)
+
+    def merge(self, other: 'VocabAnalyzer'):
+        """Fold another analyzer's results into this one."""
+        self._flush_values()
+        other._flush_values()
+        for path in other._wide_fields - self._wide_fields:
+            self.field_values[path].clear()
+            self._wide_fields.add(path)
+        for path, value_counts in other.field_values.items():
+            if path not in self._wide_fields:
+                self._update_counts(path, value_counts)
+        for path, count in other.field_total_count.items():
+            self.field_total_count[path] += count
+
+    def identify_controlled_vocab(self, max_unique_values=None):
+        """
+        Identify fields that are likely controlled vocabularies.
+
+        max_unique_values defaults to (and cannot usefully exceed) the
+        analyzer's own cap, since wider fields stop being counted at ingestion.
+        """
+        self._flush_values()
+        if max_unique_values is None:
+            max_unique_values = self.max_unique_values
         vocab_fields = {}
 
         for path, value_counts in self.field_values.items():
+            if path in self._wide_fields:
+                continue
+
             unique_count = len(value_counts)
+            if unique_count > max_unique_values:
+                continue
+
             total_count = self.field_total_count[path]
 
             # Heuristics for controlled vocab:
@@ -82,15 +146,17 @@ class VocabAnalyzer:
             # 2. Values are reused (total_count > unique_count * 2)
             # 3. Or has very few values (< 20)
 
-            if unique_count <= max_unique_values:
-                if total_count > unique_count * 2 or unique_count < 20:
-                    vocab_fields[path] = {
-                        'unique_count': unique_count,
-                        'total_count': total_count,
-                        'reuse_ratio': round(total_count / unique_count, 2),
-                        'values': dict(value_counts.most_common(100)),
-                        'is_likely_enum': unique_count < 20
-                    }
+            if total_count > unique_count * 2 or unique_count < 20:
+                # most_common(n) runs heapq.nlargest; when all values are
+                # kept anyway a single sort (n=None) is cheaper
+                top_n = 100 if unique_count > 100 else None
+                vocab_fields[path] = {
+                    'unique_count': unique_count,
+                    'total_count': total_count,
+                    'reuse_ratio': round(total_count / unique_count, 2),
+                    'values': dict(value_counts.most_common(top_n)),
+                    'is_likely_enum': unique_count < 20
+                }
 
         return vocab_fields
 
@@ -130,15 +196,13 @@ def main():
     print("\n🐉 Analyzing Monsters...")
     bestiary_dir = DATA_DIR / 'bestiary'
     if bestiary_dir.exists():
-        for json_file in sorted(bestiary_dir.glob('*.json')):
-            analyzer.analyze_file(json_file, 'monster')
+        analyze_files(analyzer, sorted(bestiary_dir.glob('*.json')), 'monster')
 
     # Analyze spells
     print("\n✨ Analyzing Spells...")
     spells_dir = DATA_DIR / 'spells'
     if spells_dir.exists():
-        for json_file in sorted(spells_dir.glob('*.json')):
-            analyzer.analyze_file(json_file, 'spell')
+        analyze_files(analyzer, sorted(spells_dir.glob('*.json')), 'spell')
 
     # Generate report
     print("\n📊 Generating report...")
@@ -146,8 +210,7 @@ def main():
 
     # Save
     OUTPUT_FILE.parent.mkdir(parents=True, exist_ok=True)
-    with open(OUTPUT_FILE, 'w', encoding='utf-8') as f:
-        json.dump(report, f, indent=2)
+    dump_json(report, OUTPUT_FILE)
 
     print(f"\n✅ Report saved to: {OUTPUT_FILE}")
 
@@ -8,104 +8,164 @@ Identifies polymorphic fields and type inconsistencies:
 - Edge cases
 """
 
-import json
 from pathlib import Path
 from collections import defaultdict
+from itertools import islice
 from typing import Any, Dict
 
+from json_helpers import load_json, dump_json
+from analysis_helpers import analyze_files, child_path, PATH_CACHE
+
 
 DATA_DIR = Path('/home/ctabone/dnd_bot/5etools-src-2.15.0/data')
 OUTPUT_FILE = Path('analysis/field_types_report.json')
 
+# JSON scalar types; parsed JSON only ever yields these exact types, so
+# type(value) membership replaces isinstance MRO walks
+_SCALAR_TYPES = (str, int, float, bool, type(None))
+# Scalars plus dict and list: once a path has seen this many element
+# types there is nothing left to discover
+_JSON_TYPE_COUNT = len(_SCALAR_TYPES) + 2
+
+
+class FieldTypeInfo:
+    """
+    Per-path type record (slotted: many thousands are created).
+
+    type_examples and array_element_types are keyed by the type objects
+    themselves (identity hash, no name lookup); to_dict maps them to names.
+    """
+
+    __slots__ = ('type_examples', 'polymorphic', 'array_element_types', 'total_count')
+
+    def __init__(self):
+        self.type_examples = defaultdict(list)
+        self.polymorphic = False
+        self.array_element_types = set()
+        self.total_count = 0
+
 
 class TypeAnalyzer:
     """Analyzes field type variations."""
 
+    # Sampling limits
+    LIST_SAMPLE = 10          # items walked per array
+    ELEMENT_TYPE_SAMPLE = 20  # items checked for array_element_types
+    DICT_KEY_SAMPLE = 10      # keys stored in a dict example
+    MAX_EXAMPLES = 3          # examples kept per type per path
+
     def __init__(self):
-        self.field_types = defaultdict(lambda: {
-            'type_examples': defaultdict(list),
-            'polymorphic': False,
-            'array_element_types': set(),
-            'total_count': 0
-        })
+        self.field_types = defaultdict(FieldTypeInfo)
 
     def analyze_value(self, value: Any, path: str):
-        """Analyze type of a value."""
-        field_info = self.field_types[path]
-        field_info['total_count'] += 1
-
-        type_name = type(value).__name__
-
-        # Store example for this type (up to 3 examples per type)
-        if len(field_info['type_examples'][type_name]) < 3:
-            if isinstance(value, (str, int, float, bool, type(None))):
-                field_info['type_examples'][type_name].append(value)
-            elif isinstance(value, dict):
-                field_info['type_examples'][type_name].append({
-                    '__sample__': 'dict',
-                    'keys': list(value.keys())[:10]
-                })
-            elif isinstance(value, list):
-                field_info['type_examples'][type_name].append({
-                    '__sample__': 'list',
-                    'length': len(value),
-                    'element_types': list(set(type(x).__name__ for x in value[:10]))
-                })
-
-        # Check for polymorphic fields
-        if len(field_info['type_examples']) > 1:
-            field_info['polymorphic'] = True
-
-        # Analyze array element types
-        if isinstance(value, list):
-            for item in value[:20]:  # Sample first 20
-                field_info['array_element_types'].add(type(item).__name__)
-
-        # Recurse
-        if isinstance(value, dict):
-            for key, val in value.items():
-                new_path = f"{path}.{key}" if path else key
-                self.analyze_value(val, new_path)
-        elif isinstance(value, list):
-            for item in value[:10]:  # Sample first 10
-                new_path = f"{path}[]"
-                self.analyze_value(item, new_path)
+        """Analyze type of a value (iterative pre-order walk)."""
+        path_cache = PATH_CACHE
+        list_sample = self.LIST_SAMPLE
+        stack = [(value, path)]
+        while stack:
+            value, path = stack.pop()
+
+            field_info = self.field_types[path]
+            field_info.total_count += 1
+
+            value_type = type(value)
+            examples = field_info.type_examples[value_type]
+
+            # Store example for this type (up to MAX_EXAMPLES per type)
+            if len(examples) < self.MAX_EXAMPLES:
+                if value_type in _SCALAR_TYPES:
+                    examples.append(value)
+                elif value_type is dict:
+                    examples.append({
+                        '__sample__': 'dict',
+                        'keys': list(islice(value, self.DICT_KEY_SAMPLE))
+                    })
+                elif value_type is list:
+                    examples.append({
+                        '__sample__': 'list',
+                        'length': len(value),
+                        'element_types': [t.__name__ for t in set(map(type, islice(value, list_sample)))]
+                    })
+
+            # Check for polymorphic fields
+            if not field_info.polymorphic and len(field_info.type_examples) > 1:
+                field_info.polymorphic = True
+
+            # Push children in reverse so they pop in document order
+            if value_type is dict:
+                stack.extend(reversed([
+                    (val, path_cache.get((path, key)) or child_path(path, key))
+                    for key, val in value.items()
+                ]))
+            elif value_type is list:
+                # Analyze array element types (sample first 20), unless every
+                # JSON type has already been seen for this path
+                element_types = field_info.array_element_types
+                if len(element_types) < _JSON_TYPE_COUNT:
+                    element_types.update(map(type, islice(value, self.ELEMENT_TYPE_SAMPLE)))
+
+                item_path = path_cache.get((path, None)) or child_path(path)
+                stack.extend((item, item_path) for item in reversed(value[:list_sample]))
+
+    def analyze_data(self, data: Any, root_key: str = None, default_path: str = ''):
+        """Analyze an already-parsed JSON document."""
+        if root_key and root_key in data:
+            items = data[root_key]
+            if isinstance(items, list):
+                for item in items:
+                    self.analyze_value(item, root_key)
+        else:
+            self.analyze_value(data, default_path)
 
     def analyze_file(self, filepath: Path, root_key: str = None):
         """Analyze a single JSON file."""
         print(f"  Analyzing {filepath.name}...")
 
         try:
-            with open(filepath, 'r', encoding='utf-8') as f:
-                data = json.load(f)
-
-            if root_key and root_key in data:
-                items = data[root_key]
-                if isinstance(items, list):
-                    for item in items:
-                        self.analyze_value(item, root_key)
-            else:
-                self.analyze_value(data, filepath.stem)
+            self.analyze_data(load_json(filepath), root_key, filepath.stem)
 
         except Exception as e:
             print(f"    ❌ Error: {e}")
 
+    def merge(self, other: 'TypeAnalyzer'):
+        """Fold another analyzer's results into this one."""
+        for path, other_info in other.field_types.items():
+            field_info = self.field_types[path]
+            field_info.total_count += other_info.total_count
+            for value_type, examples in other_info.type_examples.items():
+                stored = field_info.type_examples[value_type]
+                stored.extend(examples[:self.MAX_EXAMPLES - len(stored)])
+            if len(field_info.type_examples) > 1 or other_info.polymorphic:
+                field_info.polymorphic = True
+            field_info.array_element_types.update(other_info.array_element_types)
+
     def to_dict(self) -> Dict:
         """Convert to serializable dict."""
         result = {}
         for path, info in sorted(self.field_types.items()):
             result[path] = {
-                'total_count': info['total_count'],
+                'total_count': info.total_count,
                 'type_examples': {
-                    k: v for k, v in info['type_examples'].items()
+                    t.__name__: v for t, v in info.type_examples.items()
                 },
-                'polymorphic': info['polymorphic'],
-                'num_types': len(info['type_examples']),
-                'array_element_types': list(info['array_element_types']) if info['array_element_types'] else None
+                'polymorphic': info.polymorphic,
+                'num_types': len(info.type_examples),
+                'array_element_types': sorted(t.__name__ for t in info.array_element_types) if info.array_element_types else None
             }
         return result
 
 
+def build_report(analyzer: TypeAnalyzer) -> Dict:
+    """Build the field type report written to OUTPUT_FILE."""
+    return {
+        'summary': {
+            'total_fields': len(analyzer.field_types),
+            'polymorphic_fields': sum(1 for f in analyzer.field_types.values() if f.polymorphic)
+        },
+        'fields': analyzer.to_dict()
+    }
+
+
 def main():
     """Main execution."""
     print("=" * 60)
@@ -124,30 +184,21 @@ def main():
     print("\n🐉 Analyzing Monsters...")
     bestiary_dir = DATA_DIR / 'bestiary'
     if bestiary_dir.exists():
-        for json_file in sorted(bestiary_dir.glob('*.json'))[:5]:
-            analyzer.analyze_file(json_file, 'monster')
+        analyze_files(analyzer, sorted(bestiary_dir.glob('*.json'))[:5], 'monster')
 
     # Analyze spells
     print("\n✨ Analyzing Spells...")
     spells_dir = DATA_DIR / 'spells'
     if spells_dir.exists():
-        for json_file in sorted(spells_dir.glob('*.json'))[:5]:
-            analyzer.analyze_file(json_file, 'spell')
+        analyze_files(analyzer, sorted(spells_dir.glob('*.json'))[:5], 'spell')
 
     # Generate report
     print("\n📊 Generating report...")
-    report = {
-        'summary': {
-            'total_fields': len(analyzer.field_types),
-            'polymorphic_fields': sum(1 for f in analyzer.field_types.values() if f['polymorphic'])
-        },
-        'fields': analyzer.to_dict()
-    }
+    report = build_report(analyzer)
 
     # Save
     OUTPUT_FILE.parent.mkdir(parents=True, exist_ok=True)
-    with open(OUTPUT_FILE, 'w', encoding='utf-8') as f:
-        json.dump(report, f, indent=2)
+    dump_json(report, OUTPUT_FILE)
 
     print(f"\n✅ Report saved to: {OUTPUT_FILE}")
 
@@ -156,9 +207,9 @@ def main():
     print("⚠️  Polymorphic Fields (Need Special Handling)")
     print("=" * 60)
 
-    polymorphic = {k: v for k, v in analyzer.field_types.items() if v['polymorphic']}
+    polymorphic = {k: v for k, v in analyzer.field_types.items() if v.polymorphic}
     for path, info in sorted(polymorphic.items())[:30]:
-        types = list(info['type_examples'].keys())
+        types = [t.__name__ for t in info.type_examples]
         print(f"  {path:40s} types={types}")
 
     print(f"\n📊 Total polymorphic fields: {len(polymorphic)}")
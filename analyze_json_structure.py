@@ -10,109 +10,179 @@ This script recursively walks through JSON files to:
 - Sample values
 """
 
-import json
 from pathlib import Path
 from collections import defaultdict, Counter
+from itertools import islice
 from typing import Any, Dict, Set
 import sys
 
+import ijson
+
+from json_helpers import load_json, dump_json
+from analysis_helpers import analyze_files, child_path, PATH_CACHE
+
 
 DATA_DIR = Path('/home/ctabone/dnd_bot/5etools-src-2.15.0/data')
 OUTPUT_FILE = Path('analysis/structure_report.json')
 
+# JSON scalar types; parsed JSON only ever yields these exact types, so
+# type(value) membership replaces isinstance MRO walks
+_SCALAR_TYPES = (str, int, float, bool)
+
+
+class FieldInfo:
+    """Per-path structure record (slotted: many thousands are created)."""
+
+    __slots__ = ('count', 'types', 'sample_values', 'sample_values_set',
+                 'null_count', 'max_depth')
+
+    def __init__(self):
+        self.count = 0
+        self.types = Counter()
+        self.sample_values = []
+        self.sample_values_set = set()
+        self.null_count = 0
+        self.max_depth = 0
+
 
 class StructureAnalyzer:
     """Analyzes JSON structure recursively."""
 
+    # Sampling limits
+    LIST_SAMPLE = 5         # items walked per array
+    DICT_KEY_SAMPLE = 5     # keys shown in a dict sample
+    MAX_SAMPLE_VALUES = 10  # unique sample values kept per path
+
     def __init__(self):
-        self.fields = defaultdict(lambda: {
-            'count': 0,
-            'types': Counter(),
-            'paths': set(),
-            'sample_values': [],
-            'null_count': 0,
-            'max_depth': 0
-        })
+        self.fields = defaultdict(FieldInfo)
 
     def analyze_value(self, value: Any, path: str, depth: int = 0):
-        """Recursively analyze a value and its structure."""
-        field_info = self.fields[path]
-        field_info['count'] += 1
-        field_info['paths'].add(path)
-        field_info['max_depth'] = max(field_info['max_depth'], depth)
-
-        if value is None:
-            field_info['null_count'] += 1
-            field_info['types']['null'] += 1
-            return
-
-        type_name = type(value).__name__
-        field_info['types'][type_name] += 1
-
-        # Store sample values (up to 10 unique)
-        if len(field_info['sample_values']) < 10:
-            if isinstance(value, (str, int, float, bool)):
-                if value not in field_info['sample_values']:
-                    field_info['sample_values'].append(value)
-            elif isinstance(value, dict):
-                # Store keys of dict as sample
-                sample = f"dict({len(value)} keys: {list(value.keys())[:5]})"
-                if sample not in field_info['sample_values']:
-                    field_info['sample_values'].append(sample)
-            elif isinstance(value, list):
-                sample = f"list({len(value)} items)"
-                if sample not in field_info['sample_values']:
-                    field_info['sample_values'].append(sample)
-
-        # Recurse into structures
-        if isinstance(value, dict):
-            for key, val in value.items():
-                new_path = f"{path}.{key}" if path else key
-                self.analyze_value(val, new_path, depth + 1)
-
-        elif isinstance(value, list):
-            for i, item in enumerate(value[:5]):  # Sample first 5 items
-                new_path = f"{path}[]"
-                self.analyze_value(item, new_path, depth + 1)
+        """Analyze a value and its structure (iterative pre-order walk)."""
+        path_cache = PATH_CACHE
+        list_sample = self.LIST_SAMPLE
+        max_sample_values = self.MAX_SAMPLE_VALUES
+        stack = [(value, path, depth)]
+        while stack:
+            value, path, depth = stack.pop()
+
+            field_info = self.fields[path]
+            field_info.count += 1
+            field_info.max_depth = max(field_info.max_depth, depth)
+
+            if value is None:
+                field_info.null_count += 1
+                field_info.types['null'] += 1
+                continue
+
+            value_type = type(value)
+            field_info.types[value_type.__name__] += 1
+
+            # Store sample values (up to 10 unique); the set gives O(1)
+            # dedup while the list keeps first-seen order for the report
+            if len(field_info.sample_values) < max_sample_values:
+                if value_type in _SCALAR_TYPES:
+                    sample = value
+                elif value_type is dict:
+                    # Store keys of dict as sample
+                    sample = f"dict({len(value)} keys: {list(islice(value, self.DICT_KEY_SAMPLE))})"
+                else:
+                    sample = f"list({len(value)} items)"
+
+                if sample not in field_info.sample_values_set:
+                    field_info.sample_values_set.add(sample)
+                    field_info.sample_values.append(sample)
+
+            # Push children in reverse so they pop in document order
+            if value_type is dict:
+                stack.extend(reversed([
+                    (val, path_cache.get((path, key)) or child_path(path, key), depth + 1)
+                    for key, val in value.items()
+                ]))
+
+            elif value_type is list:
+                item_path = path_cache.get((path, None)) or child_path(path)
+                stack.extend((item, item_path, depth + 1) for item in reversed(value[:list_sample]))
+
+    def analyze_data(self, data: Any, root_key: str = None, default_path: str = ''):
+        """Analyze an already-parsed JSON document."""
+        if root_key and root_key in data:
+            items = data[root_key]
+            if isinstance(items, list):
+                print(f"    Found {len(items)} items in '{root_key}'")
+                for item in items:
+                    self.analyze_value(item, root_key, 0)
+            else:
+                self.analyze_value(items, root_key, 0)
+        else:
+            # Analyze entire structure
+            self.analyze_value(data, default_path, 0)
 
     def analyze_file(self, filepath: Path, root_key: str = None):
         """Analyze a single JSON file."""
         print(f"  Analyzing {filepath.name}...")
 
         try:
-            with open(filepath, 'r', encoding='utf-8') as f:
-                data = json.load(f)
-
-            if root_key and root_key in data:
-                items = data[root_key]
-                if isinstance(items, list):
-                    print(f"    Found {len(items)} items in '{root_key}'")
-                    for item in items:
+            if root_key:
+                # Stream one record at a time so peak memory is a single
+                # record rather than the whole parsed bestiary file
+                count = 0
+                with open(filepath, 'rb') as f:
+                    for item in ijson.items(f, f'{root_key}.item', use_float=True):
                         self.analyze_value(item, root_key, 0)
-                else:
-                    self.analyze_value(items, root_key, 0)
-            else:
-                # Analyze entire structure
-                self.analyze_value(data, filepath.stem, 0)
+                        count += 1
+
+                if count:
+                    print(f"    Found {count} items in '{root_key}'")
+                    return
+
+            # Root key missing, empty or not a list: fall back to a full parse
+            self.analyze_data(load_json(filepath), root_key, filepath.stem)
 
         except Exception as e:
             print(f"    ❌ Error: {e}")
 
+    def merge(self, other: 'StructureAnalyzer'):
+        """Fold another analyzer's results into this one."""
+        for path, other_info in other.fields.items():
+            field_info = self.fields[path]
+            field_info.count += other_info.count
+            field_info.types.update(other_info.types)
+            field_info.null_count += other_info.null_count
+            field_info.max_depth = max(field_info.max_depth, other_info.max_depth)
+            for value in other_info.sample_values:
+                if len(field_info.sample_values) >= self.MAX_SAMPLE_VALUES:
+                    break
+                if value not in field_info.sample_values_set:
+                    field_info.sample_values_set.add(value)
+                    field_info.sample_values.append(value)
+
     def to_dict(self) -> Dict:
         """Convert analysis results to serializable dict."""
         result = {}
+        max_count = max((f.count for f in self.fields.values()), default=0)
         for path, info in sorted(self.fields.items()):
             result[path] = {
-                'count': info['count'],
-                'types': dict(info['types']),
-                'sample_values': info['sample_values'][:10],
-                'null_count': info['null_count'],
-                'max_depth': info['max_depth'],
-                'optional': info['null_count'] > 0 or info['count'] < max(f['count'] for f in self.fields.values())
+                'count': info.count,
+                'types': dict(info.types),
+                'sample_values': info.sample_values[:self.MAX_SAMPLE_VALUES],
+                'null_count': info.null_count,
+                'max_depth': info.max_depth,
+                'optional': info.null_count > 0 or info.count < max_count
             }
         return result
 
 
+def build_report(analyzer: StructureAnalyzer) -> Dict:
+    """Build the structure report written to OUTPUT_FILE."""
+    return {
+        'summary': {
+            'total_unique_fields': len(analyzer.fields),
+            'files_analyzed': 'items-base.json, items.json, bestiary/*.json (5 files), spells/*.json (5 files)'
+        },
+        'fields': analyzer.to_dict()
+    }
+
+
 def main():
     """Main execution."""
     print("=" * 60)
@@ -135,30 +205,21 @@ def main():
     print("\n🐉 Analyzing Monsters...")
     bestiary_dir = DATA_DIR / 'bestiary'
     if bestiary_dir.exists():
-        for json_file in sorted(bestiary_dir.glob('*.json'))[:5]:  # Sample first 5 files
-            analyzer.analyze_file(json_file, 'monster')
+        analyze_files(analyzer, sorted(bestiary_dir.glob('*.json'))[:5], 'monster')  # Sample first 5 files
 
     # Analyze spells
     print("\n✨ Analyzing Spells...")
     spells_dir = DATA_DIR / 'spells'
     if spells_dir.exists():
-        for json_file in sorted(spells_dir.glob('*.json'))[:5]:  # Sample first 5 files
-            analyzer.analyze_file(json_file, 'spell')
+        analyze_files(analyzer, sorted(spells_dir.glob('*.json'))[:5], 'spell')  # Sample first 5 files
 
     # Generate report
     print("\n📊 Generating report...")
-    report = {
-        'summary': {
-            'total_unique_fields': len(analyzer.fields),
-            'files_analyzed': 'items-base.json, items.json, bestiary/*.json (5 files), spells/*.json (5 files)'
-        },
-        'fields': analyzer.to_dict()
-    }
+    report = build_report(analyzer)
 
     # Save report
     OUTPUT_FILE.parent.mkdir(parents=True, exist_ok=True)
-    with open(OUTPUT_FILE, 'w', encoding='utf-8') as f:
-        json.dump(report, f, indent=2)
+    dump_json(report, OUTPUT_FILE)
 
     print(f"\n✅ Report saved to: {OUTPUT_FILE}")
     print(f"📈 Total unique field paths: {len(analyzer.fields)}")
@@ -8,21 +8,39 @@ Identifies:
 - Cross-references between data types
 """
 
-import json
 from pathlib import Path
 from collections import defaultdict
+from typing import Any
+
+from json_helpers import load_json, dump_json
+from analysis_helpers import analyze_files, child_path, PATH_CACHE
 
 
 DATA_DIR = Path('/home/ctabone/dnd_bot/5etools-src-2.15.0/data')
 OUTPUT_FILE = Path('analysis/relationships.json')
 
 
+class ArrayInfo:
+    """Per-path array relationship record."""
+
+    __slots__ = ('types', 'examples')
+
+    def __init__(self):
+        self.types = set()
+        self.examples = []
+
+
 class RelationshipAnalyzer:
     """Analyzes relationships between data entities."""
 
+    # Sampling limits
+    LIST_SAMPLE = 10   # items walked per array
+    MAX_EXAMPLES = 5   # array examples kept per path
+    EXAMPLE_ITEMS = 3  # leading items shown in an array example
+
     def __init__(self):
         self.potential_fks = defaultdict(set)
-        self.array_relationships = defaultdict(lambda: {'types': set(), 'examples': []})
+        self.array_relationships = defaultdict(ArrayInfo)
         self.reference_patterns = defaultdict(list)
 
     def analyze_potential_fk(self, value, path):
@@ -30,64 +48,87 @@ class RelationshipAnalyzer:
         # Common FK patterns
         fk_indicators = ['source', 'type', 'school', 'rarity', 'size', 'alignment']
 
-        if isinstance(value, str):
+        if type(value) is str:
             for indicator in fk_indicators:
                 if indicator in path.lower():
                     self.potential_fks[path].add(value)
 
     def analyze_array_relationship(self, value, path):
         """Analyze array fields that might represent relationships."""
-        if isinstance(value, list) and len(value) > 0:
+        if type(value) is list and len(value) > 0:
             element_types = set(type(x).__name__ for x in value)
-            self.array_relationships[path]['types'].update(element_types)
+            self.array_relationships[path].types.update(element_types)
 
             # Store examples
-            if len(self.array_relationships[path]['examples']) < 5:
-                self.array_relationships[path]['examples'].append({
+            if len(self.array_relationships[path].examples) < self.MAX_EXAMPLES:
+                head = value[:self.EXAMPLE_ITEMS]
+                self.array_relationships[path].examples.append({
                     'length': len(value),
-                    'sample': value[:3] if all(isinstance(x, (str, int)) for x in value[:3]) else 'complex'
+                    'sample': head if all(isinstance(x, (str, int)) for x in head) else 'complex'
                 })
 
     def analyze_references(self, obj, parent_path=''):
-        """Find cross-references between entities."""
-        if isinstance(obj, dict):
-            # Look for name/id pairs that might indicate references
-            if 'name' in obj and 'source' in obj:
-                self.reference_patterns[parent_path].append({
-                    'type': 'named_entity',
-                    'name': obj.get('name'),
-                    'source': obj.get('source')
-                })
-
-            for key, value in obj.items():
-                new_path = f"{parent_path}.{key}" if parent_path else key
-                self.analyze_potential_fk(value, new_path)
-                self.analyze_array_relationship(value, new_path)
-                self.analyze_references(value, new_path)
-
-        elif isinstance(obj, list):
-            for item in obj[:10]:  # Sample first 10
-                self.analyze_references(item, parent_path)
+        """Find cross-references between entities (iterative pre-order walk)."""
+        # Entries are (value, path, is_dict_child); FK/array checks run on
+        # pop so they happen in the same order as a recursive walk.
+        path_cache = PATH_CACHE
+        stack = [(obj, parent_path, False)]
+        while stack:
+            obj, parent_path, is_dict_child = stack.pop()
+
+            if is_dict_child:
+                self.analyze_potential_fk(obj, parent_path)
+                self.analyze_array_relationship(obj, parent_path)
+
+            if type(obj) is dict:
+                # Look for name/id pairs that might indicate references
+                if 'name' in obj and 'source' in obj:
+                    self.reference_patterns[parent_path].append({
+                        'type': 'named_entity',
+                        'name': obj.get('name'),
+                        'source': obj.get('source')
+                    })
+
+                # Push children in reverse so they pop in document order
+                stack.extend(reversed([
+                    (value, path_cache.get((parent_path, key)) or child_path(parent_path, key), True)
+                    for key, value in obj.items()
+                ]))
+
+            elif type(obj) is list:
+                stack.extend((item, parent_path, False) for item in reversed(obj[:self.LIST_SAMPLE]))
+
+    def analyze_data(self, data: Any, root_key: str = None, default_path: str = ''):
+        """Analyze an already-parsed JSON document."""
+        if root_key and root_key in data:
+            items = data[root_key]
+            if isinstance(items, list):
+                for item in items:
+                    self.analyze_references(item, root_key)
+        else:
+            self.analyze_references(data, default_path)
 
     def analyze_file(self, filepath: Path, root_key: str = None):
         """Analyze a single JSON file."""
         print(f"  Analyzing {filepath.name}...")
 
         try:
-            with open(filepath, 'r', encoding='utf-8') as f:
-                data = json.load(f)
-
-            if root_key and root_key in data:
-                items = data[root_key]
-                if isinstance(items, list):
-                    for item in items:
-                        self.analyze_references(item, root_key)
-            else:
-                self.analyze_references(data, filepath.stem)
+            self.analyze_data(load_json(filepath), root_key, filepath.stem)
 
         except Exception as e:
             print(f"    ❌ Error: {e}")
 
+    def merge(self, other: 'RelationshipAnalyzer'):
+        """Fold another analyzer's results into this one."""
+        for path, values in other.potential_fks.items():
+            self.potential_fks[path].update(values)
+        for path, other_info in other.array_relationships.items():
+            info = self.array_relationships[path]
+            info.types.update(other_info.types)
+            info.examples.extend(other_info.examples[:self.MAX_EXAMPLES - len(info.examples)])
+        for path, refs in other.reference_patterns.items():
+            self.reference_patterns[path].extend(refs)
+
     def to_dict(self) -> dict:
         """Convert to serializable dict."""
         return {
@@ -100,11 +141,11 @@ class RelationshipAnalyzer:
             },
             'array_relationships': {
                 path: {
-                    'element_types': list(info['types']),
-                    'examples': info['examples']
+                    'element_types': list(info.types),
+                    'examples': info.examples
                 }
                 for path, info in self.array_relationships.items()
-                if len(info['examples']) > 0
+                if len(info.examples) > 0
             },
             'named_entities': {
                 path: {
@@ -135,15 +176,13 @@ def main():
     print("\n🐉 Analyzing Monsters...")
     bestiary_dir = DATA_DIR / 'bestiary'
     if bestiary_dir.exists():
-        for json_file in sorted(bestiary_dir.glob('*.json'))[:5]:
-            analyzer.analyze_file(json_file, 'monster')
+        analyze_files(analyzer, sorted(bestiary_dir.glob('*.json'))[:5], 'monster')
 
     # Analyze spells
     print("\n✨ Analyzing Spells...")
     spells_dir = DATA_DIR / 'spells'
     if spells_dir.exists():
-        for json_file in sorted(spells_dir.glob('*.json'))[:5]:
-            analyzer.analyze_file(json_file, 'spell')
+        analyze_files(analyzer, sorted(spells_dir.glob('*.json'))[:5], 'spell')
 
     # Generate report
     print("\n📊 Generating report...")
@@ -151,8 +190,7 @@ def main():
 
     # Save
     OUTPUT_FILE.parent.mkdir(parents=True, exist_ok=True)
-    with open(OUTPUT_FILE, 'w', encoding='utf-8') as f:
-        json.dump(report, f, indent=2)
+    dump_json(report, OUTPUT_FILE)
 
     print(f"\n✅ Report saved to: {OUTPUT_FILE}")
 
@@ -7,6 +7,8 @@ import sys
 import time
 from pathlib import Path
 
+import script_helpers
+
 
 def print_banner(text):
     """Print a nice banner."""
@@ -38,6 +40,32 @@ def run_script(script_name, description):
         return False, elapsed
 
 
+def run_scripts_parallel(scripts):
+    """
+    Run independent Python scripts concurrently and track timing.
+
+    Each script's output goes to logs/<script>.log so console output
+    doesn't interleave.
+
+    Returns:
+        Dict mapping description -> (success, elapsed), in script order
+    """
+    print_banner(" + ".join(description for _, description in scripts) + " (parallel)")
+    descriptions = dict(scripts)
+
+    finished = {}
+    for script_name, returncode, elapsed, log_path in script_helpers.run_scripts_parallel(descriptions):
+        description = descriptions[script_name]
+        success = returncode == 0
+        finished[description] = (success, elapsed)
+        if success:
+            print(f"\n✅ {description} completed in {elapsed:.1f}s")
+        else:
+            print(f"\n❌ {description} failed after {elapsed:.1f}s! See {log_path}")
+
+    return {description: finished[description] for _, description in scripts}
+
+
 def main():
     """Main execution."""
     print_banner("5etools Data Cleaning Pipeline")
@@ -51,24 +79,29 @@ def main():
     total_start = time.time()
     results = {}
 
-    # Run cleaning scripts in order
-    scripts = [
+    # Stage 1: the cleaners write separate output files, so run them together
+    cleaning_scripts = [
         ('clean_items.py', 'Item Data Cleaning'),
         ('clean_monsters.py', 'Monster Data Cleaning'),
         ('clean_spells.py', 'Spell Data Cleaning'),
-        ('validate_cleaned.py', 'Data Validation'),
     ]
 
-    for script, description in scripts:
-        success, elapsed = run_script(script, description)
+    for description, (success, elapsed) in run_scripts_parallel(cleaning_scripts).items():
         results[description] = {
             "success": success,
             "time": elapsed
         }
 
-        if not success:
-            print(f"\n❌ Stopping pipeline due to failure in: {description}")
-            break
+    failed = [desc for desc, result in results.items() if not result["success"]]
+    if failed:
+        print(f"\n❌ Stopping pipeline due to failure in: {', '.join(failed)}")
+    else:
+        # Stage 2: validation reads all three cleaned files
+        success, elapsed = run_script('validate_cleaned.py', 'Data Validation')
+        results['Data Validation'] = {
+            "success": success,
+            "time": elapsed
+        }
 
     # Generate summary report
     total_elapsed = time.time() - total_start
@@ -4,13 +4,65 @@ Clean and normalize item data from 5etools.
 Eliminates polymorphic fields and ensures consistent data structure.
 """
 
-import json
+import re
+import sys
+from concurrent.futures import ProcessPoolExecutor
+from functools import lru_cache
 from pathlib import Path
-from typing import Any, Dict, List
+from typing import Any, Dict, List, Optional, Tuple
+
+from json_helpers import dump_json, encode_records, iter_records, write_json_array
 
 
 DATA_DIR = Path('/home/ctabone/dnd_bot/5etools-src-2.15.0/data')
 OUTPUT_FILE = Path('cleaned_data/items.json')
+# Record index range [start, end) of each source file within OUTPUT_FILE
+SOURCE_INDEX_FILE = Path('cleaned_data/items_source_index.json')
+
+# First-seen copy of every flattened entry string. Variant items repeat
+# their base item's text verbatim, so duplicates collapse to one object.
+# Lives per worker process and goes away with it.
+_ENTRY_POOL: Dict[str, str] = {}
+
+# Die count of the common rechargeAmount dice strings
+_RECHARGE_LUT = {
+    '1d3': 1, '1d4': 1, '1d6': 1, '1d8': 1, '1d10': 1, '1d12': 1, '1d20': 1,
+    '2d4': 2, '2d6': 2,
+}
+# Leading die count of any other dice string ("3d6" -> 3)
+_DICE_COUNT_RE = re.compile(r'\s*([+-]?\d+)\s*d')
+# "normal/long" weapon range ("30/120")
+_RANGE_RE = re.compile(r'(\d+)/(\d+)$')
+
+# Keys never carried into cleaned records (_copy is 5etools inheritance
+# metadata we don't need)
+_DROPPED_KEYS = frozenset({'_copy'})
+
+
+@lru_cache(maxsize=4096)
+def _strip_source(ref: str) -> str:
+    """
+    Remove the source suffix from a 5etools reference.
+
+    Input: "2H|XPHB" OR "Sap"
+    Output: "2H" OR "Sap"
+
+    Cached: the same few dozen property/mastery/type codes recur on
+    thousands of items. Results are interned so those items also share
+    one string object per code.
+    """
+    i = ref.find('|')
+    return sys.intern(ref if i < 0 else ref[:i])
+
+
+def _as_str_list(value: Any) -> List[str]:
+    """
+    Keep only the plain strings of a list field.
+
+    Input: ["fire", {"special": "..."}, "cold"] OR None
+    Output: ["fire", "cold"] OR []
+    """
+    return [v for v in value if type(v) is str] if type(value) is list else []
 
 
 def normalize_value(value_data: Any) -> int:
@@ -23,17 +75,13 @@ def normalize_value(value_data: Any) -> int:
         {"sp": 10, "cp": 5} → 105
         None → 0
     """
+    # Branches ordered by frequency (no value, plain number, coin dict);
+    # exact type() checks since parsed JSON never yields subclasses
     if value_data is None:
         return 0
 
-    if isinstance(value_data, dict):
-        cp = value_data.get('cp', 0)
-        sp = value_data.get('sp', 0) * 10
-        gp = value_data.get('gp', 0) * 100
-        pp = value_data.get('pp', 0) * 1000
-        return int(cp + sp + gp + pp)
-
-    if isinstance(value_data, (int, float)):
+    value_type = type(value_data)
+    if value_type is int or value_type is float:
         # Heuristic: if value > 100, assume it's already in cp
         # Otherwise assume gp and convert
         if value_data > 100:
@@ -41,6 +89,13 @@ def normalize_value(value_data: Any) -> int:
         else:
             return int(value_data * 100)  # Convert gp to cp
 
+    if value_type is dict:
+        cp = value_data.get('cp', 0)
+        sp = value_data.get('sp', 0) * 10
+        gp = value_data.get('gp', 0) * 100
+        pp = value_data.get('pp', 0) * 1000
+        return int(cp + sp + gp + pp)
+
     return 0
 
 
@@ -48,6 +103,8 @@ def normalize_weight(weight_data: Any) -> float:
     """Convert weight to always be float."""
     if weight_data is None:
         return 0.0
+    if type(weight_data) is float:
+        return weight_data
     return float(weight_data)
 
 
@@ -74,7 +131,7 @@ def normalize_property(property_data: Any) -> tuple[List[str], Dict[str, str]]:
             note = prop.get('note')
 
             # Extract property code from uid (e.g., "2H|XPHB" → "2H")
-            prop_code = uid.split('|')[0] if '|' in uid else uid
+            prop_code = _strip_source(uid)
             properties.append(prop_code)
 
             if note:
@@ -94,6 +151,9 @@ def normalize_range(range_data: Any) -> Dict[str, int]:
         return {"normal": None, "long": None}
 
     if isinstance(range_data, str):
+        match = _RANGE_RE.match(range_data)
+        if match:
+            return {"normal": int(match[1]), "long": int(match[2])}
         if '/' in range_data:
             parts = range_data.split('/')
             return {"normal": int(parts[0]), "long": int(parts[1])}
@@ -110,15 +170,23 @@ def normalize_mastery(mastery_data: Any) -> List[str]:
     """
     Ensure mastery is always array of simple strings.
 
-    Input: ["Sap|XPHB"] or None
+    Input: ["Sap|XPHB"] OR [{"name": "Sap", "uid": "Sap|XPHB"}] or None
     Output: ["Sap"]
+
+    This is the only mastery coercion: clean_item stores the result as is.
     """
     if not mastery_data:
         return []
 
     if isinstance(mastery_data, list):
-        # Extract just the mastery name, removing source suffix
-        return [m.split('|')[0] if '|' in m else m for m in mastery_data]
+        # Extract just the mastery name, removing source suffix. Only
+        # strings go through the cached _strip_source (dicts are unhashable)
+        return [
+            _strip_source(m) if type(m) is str
+            else str(m.get('name', '')) if type(m) is dict
+            else str(m)
+            for m in mastery_data
+        ]
 
     return []
 
@@ -169,9 +237,14 @@ def normalize_entries(entries: Any) -> List[str]:
         return []
 
     result = []
-    for entry in entries:
+    pool = _ENTRY_POOL.setdefault
+    # Depth-first walk with an explicit stack; entries are pushed in
+    # reverse so they pop in document order
+    stack = list(entries)[::-1]
+    while stack:
+        entry = stack.pop()
         if isinstance(entry, str):
-            result.append(entry)
+            result.append(pool(entry, entry))
         elif isinstance(entry, dict):
             # Extract text from dict structures
             if 'items' in entry:
@@ -179,10 +252,11 @@ def normalize_entries(entries: Any) -> List[str]:
                 if isinstance(items, list):
                     for item in items:
                         if isinstance(item, str):
-                            result.append(item)
+                            result.append(pool(item, item))
             elif 'entries' in entry:
-                nested = normalize_entries(entry['entries'])
-                result.extend(nested)
+                nested = entry['entries']
+                if nested:
+                    stack.extend(list(nested)[::-1])
     return result
 
 
@@ -217,12 +291,13 @@ def normalize_strength(strength: Any) -> int:
     """
     if strength is None:
         return 0
-    if isinstance(strength, str):
+    strength_type = type(strength)
+    if strength_type is str:
         try:
             return int(strength)
         except ValueError:
             return 0
-    if isinstance(strength, int):
+    if strength_type is int:
         return strength
     return 0
 
@@ -265,22 +340,6 @@ def normalize_focus(focus: Any) -> List[str]:
     return []
 
 
-def normalize_resist(resist: Any) -> List[str]:
-    """
-    Normalize resist to always be array of strings.
-
-    Input: ["fire", "cold"] OR None
-    Output: ["fire", "cold"] OR []
-    """
-    if resist is None:
-        return []
-
-    if isinstance(resist, list):
-        return [str(r) for r in resist if isinstance(r, str)]
-
-    return []
-
-
 def normalize_recharge_amount(recharge: Any) -> int:
     """
     Normalize rechargeAmount to always be int.
@@ -291,16 +350,18 @@ def normalize_recharge_amount(recharge: Any) -> int:
     if recharge is None:
         return 0
 
-    if isinstance(recharge, int):
+    recharge_type = type(recharge)
+    if recharge_type is int:
         return recharge
 
-    if isinstance(recharge, str):
+    if recharge_type is str:
+        amount = _RECHARGE_LUT.get(recharge)
+        if amount is not None:
+            return amount
         # Try to extract number from dice notation like "1d6"
         if 'd' in recharge:
-            try:
-                return int(recharge.split('d')[0])
-            except ValueError:
-                return 1
+            match = _DICE_COUNT_RE.match(recharge)
+            return int(match[1]) if match else 1
         try:
             return int(recharge)
         except ValueError:
@@ -319,10 +380,11 @@ def normalize_charges(charges: Any) -> int:
     if charges is None:
         return 0
 
-    if isinstance(charges, int):
+    charges_type = type(charges)
+    if charges_type is int:
         return charges
 
-    if isinstance(charges, str):
+    if charges_type is str:
         try:
             return int(charges)
         except ValueError:
@@ -362,10 +424,15 @@ def normalize_float_field(value: Any) -> float:
     if value is None:
         return 0.0
 
-    if isinstance(value, (int, float)):
+    value_type = type(value)
+    if value_type is float:
+        return value
+
+    # bool is kept numeric (True -> 1.0), as isinstance(value, int) allowed
+    if value_type is int or value_type is bool:
         return float(value)
 
-    if isinstance(value, str):
+    if value_type is str:
         try:
             return float(value)
         except ValueError:
@@ -374,15 +441,48 @@ def normalize_float_field(value: Any) -> float:
     return 0.0
 
 
+# Normalizers for fields every cleaned item has (applied to None if absent)
+_ITEM_DEFAULTED_NORMALIZERS = (
+    ('value', normalize_value),
+    ('weight', normalize_weight),
+)
+
+# Normalizers for optional one-field keys, applied only when present
+_ITEM_NORMALIZERS = {
+    'mastery': normalize_mastery,
+    'reprintedAs': normalize_reprinted_as,
+    'srd': normalize_srd_field,
+    'srd52': normalize_srd_field,
+    'entries': normalize_entries,
+    'packContents': normalize_pack_contents,
+    'strength': normalize_strength,
+    'reqAttune': normalize_attunement,
+    'focus': normalize_focus,
+    'resist': _as_str_list,
+    'rechargeAmount': normalize_recharge_amount,
+    'charges': normalize_charges,
+    'attachedSpells': normalize_attached_spells,
+    'vehSpeed': normalize_float_field,
+    'capCargo': normalize_float_field,
+    'additionalEntries': normalize_entries,
+}
+_ITEM_OPTIONAL_KEYS = frozenset(_ITEM_NORMALIZERS)
+
+
 def clean_item(item: Dict) -> Dict:
     """Clean a single item record."""
-    cleaned = item.copy()
+    # Build the record in one pass, leaving out metadata keys, instead of
+    # copying everything and deleting afterwards
+    cleaned = {k: v for k, v in item.items() if k not in _DROPPED_KEYS}
 
-    # Normalize value
-    cleaned['value'] = normalize_value(item.get('value'))
+    # Simple field normalizers
+    for key, normalizer in _ITEM_DEFAULTED_NORMALIZERS:
+        cleaned[key] = normalizer(item.get(key))
 
-    # Normalize weight
-    cleaned['weight'] = normalize_weight(item.get('weight'))
+    # Optional fields: one set intersection finds the few keys this item
+    # has, instead of a membership test per known key
+    for key in item.keys() & _ITEM_OPTIONAL_KEYS:
+        cleaned[key] = _ITEM_NORMALIZERS[key](item[key])
 
     # Normalize property
     properties, property_notes = normalize_property(item.get('property'))
@@ -393,6 +493,9 @@ def clean_item(item: Dict) -> Dict:
     # Default missing rarity
     if 'rarity' not in cleaned or not cleaned['rarity']:
         cleaned['rarity'] = 'none'
+    elif type(cleaned['rarity']) is str:
+        # A dozen distinct rarities: share one string object per value
+        cleaned['rarity'] = sys.intern(cleaned['rarity'])
 
     # Normalize range
     if 'range' in item:
@@ -403,82 +506,20 @@ def clean_item(item: Dict) -> Dict:
             "long": range_data["long"] if range_data["long"] is not None else 0
         }
 
-    # Normalize mastery - ensure always array of strings
-    if 'mastery' in item:
-        mastery_data = normalize_mastery(item.get('mastery'))
-        cleaned['mastery'] = [str(m) if not isinstance(m, dict) else str(m.get('name', '')) for m in mastery_data]
-
     # Ensure type is clean (remove source suffix)
-    if 'type' in cleaned and isinstance(cleaned['type'], str) and '|' in cleaned['type']:
-        cleaned['type'] = cleaned['type'].split('|')[0]
+    if 'type' in cleaned and isinstance(cleaned['type'], str):
+        cleaned['type'] = _strip_source(cleaned['type'])
 
     # Clean ammoType
-    if 'ammoType' in cleaned and isinstance(cleaned['ammoType'], str) and '|' in cleaned['ammoType']:
-        cleaned['ammoType'] = cleaned['ammoType'].split('|')[0]
-
-    # Normalize reprintedAs
-    if 'reprintedAs' in item:
-        cleaned['reprintedAs'] = normalize_reprinted_as(item['reprintedAs'])
-
-    # Normalize SRD fields
-    if 'srd' in item:
-        cleaned['srd'] = normalize_srd_field(item['srd'])
-
-    if 'srd52' in item:
-        cleaned['srd52'] = normalize_srd_field(item['srd52'])
-
-    # Normalize entries
-    if 'entries' in item:
-        cleaned['entries'] = normalize_entries(item['entries'])
-
-    # Normalize packContents
-    if 'packContents' in item:
-        cleaned['packContents'] = normalize_pack_contents(item['packContents'])
-
-    # Normalize strength
-    if 'strength' in item:
-        cleaned['strength'] = normalize_strength(item['strength'])
-
-    # Normalize attunement
-    if 'reqAttune' in item:
-        cleaned['reqAttune'] = normalize_attunement(item['reqAttune'])
-
-    # Normalize focus
-    if 'focus' in item:
-        cleaned['focus'] = normalize_focus(item['focus'])
-
-    # Normalize resist
-    if 'resist' in item:
-        cleaned['resist'] = normalize_resist(item['resist'])
-
-    # Normalize rechargeAmount
-    if 'rechargeAmount' in item:
-        cleaned['rechargeAmount'] = normalize_recharge_amount(item['rechargeAmount'])
-
-    # Normalize charges
-    if 'charges' in item:
-        cleaned['charges'] = normalize_charges(item['charges'])
-
-    # Normalize attachedSpells
-    if 'attachedSpells' in item:
-        cleaned['attachedSpells'] = normalize_attached_spells(item['attachedSpells'])
-
-    # Normalize vehicle speed
-    if 'vehSpeed' in item:
-        cleaned['vehSpeed'] = normalize_float_field(item['vehSpeed'])
-
-    # Normalize cargo capacity
-    if 'capCargo' in item:
-        cleaned['capCargo'] = normalize_float_field(item['capCargo'])
-
-    # Normalize additionalEntries
-    if 'additionalEntries' in item:
-        cleaned['additionalEntries'] = normalize_entries(item['additionalEntries'])
+    if 'ammoType' in cleaned and isinstance(cleaned['ammoType'], str):
+        cleaned['ammoType'] = _strip_source(cleaned['ammoType'])
 
     # Normalize containerCapacity
     if 'containerCapacity' in item:
         capacity = item['containerCapacity']
         if isinstance(capacity, dict):
+            # Fresh dict so the source record's nested dict is not mutated
+            cleaned['containerCapacity'] = capacity = dict(capacity)
             if 'weight' in capacity:
                 cleaned['containerCapacity']['weight'] = [normalize_float_field(w) for w in capacity['weight']] if isinstance(capacity['weight'], list) else [normalize_float_field(capacity['weight'])]
             if 'volume' in capacity:
@@ -487,65 +528,87 @@ def clean_item(item: Dict) -> Dict:
     # Normalize barDimensions
     if 'barDimensions' in item and isinstance(item['barDimensions'], dict):
         if 'h' in item['barDimensions']:
-            cleaned['barDimensions']['h'] = normalize_float_field(item['barDimensions']['h'])
-
-    # Remove _copy field entirely - it's metadata we don't need
-    if '_copy' in cleaned:
-        del cleaned['_copy']
+            cleaned['barDimensions'] = {
+                **item['barDimensions'],
+                'h': normalize_float_field(item['barDimensions']['h'])
+            }
 
     return cleaned
 
 
+def _process_file(path: Path, root_key: str) -> Optional[Tuple[int, Optional[Dict], bytes]]:
+    """
+    Clean every item in one items file (runs in a worker process).
+
+    Records are serialized here rather than returned as dicts: the encoded
+    bytes are a fraction of the size of the cleaned dicts, so neither the
+    result pickling nor the parent's accumulated output holds dict trees.
+
+    Args:
+        path: Path to items-base.json or items.json
+        root_key: Top-level key holding the item list
+
+    Returns:
+        (item count, first cleaned item, encode_records() body), or None
+        if the file is missing
+    """
+    # Read directly rather than checking exists() first: one syscall, no race
+    try:
+        items = [clean_item(item) for item in iter_records(path, root_key)]
+    except FileNotFoundError:
+        return None
+
+    return len(items), items[0] if items else None, encode_records(items)
+
+
 def main():
     """Main execution."""
     print("=" * 60)
     print("5etools Item Data Cleaning")
     print("=" * 60)
 
-    all_items = []
-
-    # Load items-base.json
-    items_base_file = DATA_DIR / 'items-base.json'
-    if items_base_file.exists():
-        print(f"\n📦 Loading {items_base_file.name}...")
-        with open(items_base_file, 'r', encoding='utf-8') as f:
-            data = json.load(f)
-            base_items = data.get('baseitem', [])
-            print(f"  Found {len(base_items)} base items")
-
-            for item in base_items:
-                cleaned = clean_item(item)
-                cleaned['_source_file'] = 'items-base.json'
-                all_items.append(cleaned)
-
-    # Load items.json
-    items_file = DATA_DIR / 'items.json'
-    if items_file.exists():
-        print(f"\n📦 Loading {items_file.name}...")
-        with open(items_file, 'r', encoding='utf-8') as f:
-            data = json.load(f)
-            magic_items = data.get('item', [])
-            print(f"  Found {len(magic_items)} magic items")
-
-            for item in magic_items:
-                cleaned = clean_item(item)
-                cleaned['_source_file'] = 'items.json'
-                all_items.append(cleaned)
+    total_items = 0
+    sample = None
+    bodies = []
+    source_index = {}
+
+    # (file, root key, label) for each item file
+    sources = [
+        (DATA_DIR / 'items-base.json', 'baseitem', 'base items'),
+        (DATA_DIR / 'items.json', 'item', 'magic items'),
+    ]
+
+    # Clean both files in parallel, keeping base items first
+    with ProcessPoolExecutor() as executor:
+        results = executor.map(_process_file, [path for path, _, _ in sources],
+                               [root_key for _, root_key, _ in sources])
+        for (path, _, label), result in zip(sources, results):
+            if result is None:
+                print(f"\n⚠️  {path.name} not found, skipping")
+                continue
+            count, first, body = result
+            print(f"\n📦 Loaded {path.name}")
+            print(f"  Found {count} {label}")
+            source_index[path.name] = [total_items, total_items + count]
+            total_items += count
+            sample = sample or first
+            bodies.append(body)
 
     # Save cleaned data
-    print(f"\n💾 Saving {len(all_items)} cleaned items...")
+    print(f"\n💾 Saving {total_items} cleaned items...")
     OUTPUT_FILE.parent.mkdir(parents=True, exist_ok=True)
 
-    with open(OUTPUT_FILE, 'w', encoding='utf-8') as f:
-        json.dump(all_items, f, indent=2)
+    # One compact record per line (still a JSON array for the extract/import scripts)
+    write_json_array(bodies, OUTPUT_FILE)
+    # Source file of each record, as index ranges instead of a per-record field
+    dump_json(source_index, SOURCE_INDEX_FILE)
 
     print(f"✅ Cleaned items saved to: {OUTPUT_FILE}")
-    print(f"📊 Total items: {len(all_items)}")
+    print(f"📊 Total items: {total_items}")
 
     # Show sample
     print("\n📋 Sample cleaned item:")
-    if all_items:
-        sample = all_items[0]
+    if sample:
         print(f"  Name: {sample.get('name')}")
         print(f"  Value: {sample.get('value')} cp")
         print(f"  Weight: {sample.get('weight')} lbs")
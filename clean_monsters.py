@@ -4,13 +4,47 @@ Clean and normalize monster data from 5etools.
 Eliminates polymorphic fields and ensures consistent data structure.
 """
 
-import json
+import os
+import sys
+from concurrent.futures import ProcessPoolExecutor
 from pathlib import Path
-from typing import Any, Dict, List
+from typing import Any, Dict, List, Optional, Tuple
+
+from json_helpers import dump_json, encode_records, iter_records, write_json_array
 
 
 DATA_DIR = Path('/home/ctabone/dnd_bot/5etools-src-2.15.0/data/bestiary')
 OUTPUT_FILE = Path('cleaned_data/monsters.json')
+# Record index range [start, end) of each source file within OUTPUT_FILE
+SOURCE_INDEX_FILE = Path('cleaned_data/monsters_source_index.json')
+
+# Keys never carried into cleaned records (_copy is 5etools inheritance
+# metadata we don't need)
+_DROPPED_KEYS = frozenset({'_copy'})
+
+# Parsed CR strings; the bestiary only uses a few dozen distinct values
+# ("0", "1/8" ... "30"), so each is parsed once per process
+_CR_CACHE: Dict[str, float] = {}
+
+
+def _intern_str(value: Any) -> Any:
+    """
+    Intern value if it is a string.
+
+    Used for small-vocabulary fields (size, alignment, creature type) so
+    every record shares one string object per distinct value.
+    """
+    return sys.intern(value) if type(value) is str else value
+
+
+def _as_str_list(value: Any) -> List[str]:
+    """
+    Keep only the plain strings of a list field.
+
+    Input: ["fire", {"special": "..."}, "cold"] OR None
+    Output: ["fire", "cold"] OR []
+    """
+    return [v for v in value if type(v) is str] if type(value) is list else []
 
 
 def normalize_type(type_data: Any) -> Dict[str, Any]:
@@ -21,7 +55,7 @@ def normalize_type(type_data: Any) -> Dict[str, Any]:
     Output: {"type": "humanoid", "tags": ["orc"]}
     """
     if isinstance(type_data, str):
-        return {"type": type_data, "tags": []}
+        return {"type": _intern_str(type_data), "tags": []}
     elif isinstance(type_data, dict):
         type_val = type_data.get('type', 'unknown')
 
@@ -47,7 +81,7 @@ def normalize_type(type_data: Any) -> Dict[str, Any]:
                         normalized_tags.append(tag_name)
 
         return {
-            "type": type_val,
+            "type": _intern_str(type_val),
             "tags": normalized_tags
         }
     return {"type": "unknown", "tags": []}
@@ -97,7 +131,7 @@ def normalize_alignment(alignment_data: Any) -> List[str]:
             return ["A"]
         if "unaligned" in alignment_data.lower():
             return ["U"]
-        return [alignment_data]
+        return [_intern_str(alignment_data)]
 
     if isinstance(alignment_data, list):
         result = []
@@ -111,7 +145,7 @@ def normalize_alignment(alignment_data: Any) -> List[str]:
                     result.extend(align)
                 elif isinstance(align, str):
                     result.append(align)
-        return result if result else ["U"]
+        return [_intern_str(a) for a in result] if result else ["U"]
 
     return ["U"]
 
@@ -126,23 +160,24 @@ def normalize_speed(speed_data: Any) -> Dict[str, int]:
     if not speed_data or not isinstance(speed_data, dict):
         return {"walk": 30, "fly": 0, "swim": 0, "climb": 0, "burrow": 0}
 
-    def extract_speed(value):
-        """Extract speed number from int or dict."""
-        if isinstance(value, int):
-            return value
-        elif isinstance(value, dict):
-            return value.get('number', 0)
-        return 0
-
     return {
-        "walk": extract_speed(speed_data.get('walk', 30)),
-        "fly": extract_speed(speed_data.get('fly')),
-        "swim": extract_speed(speed_data.get('swim')),
-        "climb": extract_speed(speed_data.get('climb')),
-        "burrow": extract_speed(speed_data.get('burrow'))
+        "walk": _extract_speed(speed_data.get('walk', 30)),
+        "fly": _extract_speed(speed_data.get('fly')),
+        "swim": _extract_speed(speed_data.get('swim')),
+        "climb": _extract_speed(speed_data.get('climb')),
+        "burrow": _extract_speed(speed_data.get('burrow'))
     }
 
 
+def _extract_speed(value: Any) -> int:
+    """Extract speed number from int or dict."""
+    if isinstance(value, int):
+        return value
+    elif isinstance(value, dict):
+        return value.get('number', 0)
+    return 0
+
+
 def normalize_cr(cr_data: Any) -> float:
     """
     Convert CR from string fraction to decimal.
@@ -157,17 +192,25 @@ def normalize_cr(cr_data: Any) -> float:
         return float(cr_data)
 
     if isinstance(cr_data, str):
-        if '/' in cr_data:
-            parts = cr_data.split('/')
-            return float(parts[0]) / float(parts[1])
-        try:
-            return float(cr_data)
-        except ValueError:
-            return 0.0
+        cr = _CR_CACHE.get(cr_data)
+        if cr is None:
+            cr = _CR_CACHE[cr_data] = _parse_cr(cr_data)
+        return cr
 
     return 0.0
 
 
+def _parse_cr(cr_str: str) -> float:
+    """Parse a CR string such as "1/2" or "5" (uncached)."""
+    if '/' in cr_str:
+        parts = cr_str.split('/')
+        return float(parts[0]) / float(parts[1])
+    try:
+        return float(cr_str)
+    except ValueError:
+        return 0.0
+
+
 def normalize_hp(hp_data: Any) -> Dict[str, Any]:
     """
     Parse HP into consistent structure.
@@ -192,47 +235,12 @@ def normalize_size(size_data: Any) -> str:
     Output: "M"
     """
     if isinstance(size_data, list):
-        return size_data[0] if size_data else "M"
+        return _intern_str(size_data[0]) if size_data else "M"
     elif isinstance(size_data, str):
-        return size_data
+        return _intern_str(size_data)
     return "M"
 
 
-def normalize_damage_mods(damage_list: Any) -> List[str]:
-    """
-    Normalize resist/immune/vulnerable to simple string array.
-
-    Input: ["fire", {"special": "..."}, "cold"]
-    Output: ["fire", "cold"]
-    """
-    if not damage_list:
-        return []
-
-    result = []
-    for item in damage_list:
-        if isinstance(item, str):
-            result.append(item)
-        # Skip complex objects for now
-
-    return result
-
-
-def normalize_senses(senses: Any) -> List[str]:
-    """
-    Normalize senses to always be array of strings.
-
-    Input: ["darkvision 60 ft."] OR None
-    Output: ["darkvision 60 ft."] OR []
-    """
-    if senses is None:
-        return []
-
-    if isinstance(senses, list):
-        return [str(s) for s in senses if isinstance(s, str)]
-
-    return []
-
-
 def normalize_passive(passive: Any) -> int:
     """
     Normalize passive perception to always be int.
@@ -243,10 +251,11 @@ def normalize_passive(passive: Any) -> int:
     if passive is None:
         return 10
 
-    if isinstance(passive, int):
+    passive_type = type(passive)
+    if passive_type is int:
         return passive
 
-    if isinstance(passive, str):
+    if passive_type is str:
         try:
             return int(passive)
         except ValueError:
@@ -255,22 +264,6 @@ def normalize_passive(passive: Any) -> int:
     return 10
 
 
-def normalize_languages(languages: Any) -> List[str]:
-    """
-    Normalize languages to always be array of strings.
-
-    Input: ["Common", "Elvish"] OR None
-    Output: ["Common", "Elvish"] OR []
-    """
-    if languages is None:
-        return []
-
-    if isinstance(languages, list):
-        return [str(lang) for lang in languages if isinstance(lang, str)]
-
-    return []
-
-
 def normalize_optional_list_field(field: Any) -> List[Dict]:
     """
     Normalize optional fields like trait, action, reaction, legendary, spellcasting.
@@ -287,22 +280,6 @@ def normalize_optional_list_field(field: Any) -> List[Dict]:
     return []
 
 
-def normalize_group(group: Any) -> List[str]:
-    """
-    Normalize group to always be array of strings.
-
-    Input: ["Demon"] OR None
-    Output: ["Demon"] OR []
-    """
-    if group is None:
-        return []
-
-    if isinstance(group, list):
-        return [str(g) for g in group if isinstance(g, str)]
-
-    return []
-
-
 def normalize_short_name(short_name: Any) -> str:
     """
     Normalize shortName to always be string.
@@ -344,40 +321,51 @@ def normalize_gear(gear: Any) -> List[str]:
     return result
 
 
-def clean_monster(monster: Dict) -> Dict:
-    """Clean a single monster record."""
-    cleaned = monster.copy()
-
-    # Normalize type
-    cleaned['type'] = normalize_type(monster.get('type'))
+# Normalizers for fields every cleaned monster has (applied to None if absent)
+_MONSTER_DEFAULTED_NORMALIZERS = (
+    ('type', normalize_type),
+    ('ac', normalize_ac),
+    ('alignment', normalize_alignment),
+    ('speed', normalize_speed),
+    ('cr', normalize_cr),
+    ('hp', normalize_hp),
+    ('size', normalize_size),
+)
+
+# Normalizers for optional one-field keys, applied only when present
+_MONSTER_NORMALIZERS = {
+    'resist': _as_str_list,
+    'immune': _as_str_list,
+    'vulnerable': _as_str_list,
+    'senses': _as_str_list,
+    'passive': normalize_passive,
+    'languages': _as_str_list,
+    'trait': normalize_optional_list_field,
+    'action': normalize_optional_list_field,
+    'reaction': normalize_optional_list_field,
+    'legendary': normalize_optional_list_field,
+    'spellcasting': normalize_optional_list_field,
+    'group': _as_str_list,
+    'shortName': normalize_short_name,
+    'gear': normalize_gear,
+}
+_MONSTER_OPTIONAL_KEYS = frozenset(_MONSTER_NORMALIZERS)
 
-    # Normalize AC
-    cleaned['ac'] = normalize_ac(monster.get('ac'))
 
-    # Normalize alignment
-    cleaned['alignment'] = normalize_alignment(monster.get('alignment'))
-
-    # Normalize speed
-    cleaned['speed'] = normalize_speed(monster.get('speed'))
-
-    # Normalize CR
-    cleaned['cr'] = normalize_cr(monster.get('cr'))
-
-    # Normalize HP
-    cleaned['hp'] = normalize_hp(monster.get('hp'))
-
-    # Normalize size
-    cleaned['size'] = normalize_size(monster.get('size'))
-
-    # Normalize damage modifiers
-    if 'resist' in monster:
-        cleaned['resist'] = normalize_damage_mods(monster.get('resist'))
+def clean_monster(monster: Dict) -> Dict:
+    """Clean a single monster record."""
+    # Build the record in one pass, leaving out metadata keys, instead of
+    # copying everything and deleting afterwards
+    cleaned = {k: v for k, v in monster.items() if k not in _DROPPED_KEYS}
 
-    if 'immune' in monster:
-        cleaned['immune'] = normalize_damage_mods(monster.get('immune'))
+    # Field normalizers
+    for key, normalizer in _MONSTER_DEFAULTED_NORMALIZERS:
+        cleaned[key] = normalizer(monster.get(key))
 
-    if 'vulnerable' in monster:
-        cleaned['vulnerable'] = normalize_damage_mods(monster.get('vulnerable'))
+    # Optional fields: one set intersection finds the keys this monster
+    # has, instead of a membership test per known key
+    for key in monster.keys() & _MONSTER_OPTIONAL_KEYS:
+        cleaned[key] = _MONSTER_NORMALIZERS[key](monster[key])
 
     # Normalize condition immunities to simple array
     if 'conditionImmune' in monster:
@@ -387,51 +375,37 @@ def clean_monster(monster: Dict) -> Dict:
                 c for c in cond_immune if isinstance(c, str)
             ]
 
-    # Normalize senses
-    if 'senses' in monster:
-        cleaned['senses'] = normalize_senses(monster.get('senses'))
-
-    # Normalize passive perception
-    if 'passive' in monster:
-        cleaned['passive'] = normalize_passive(monster.get('passive'))
-
-    # Normalize languages
-    if 'languages' in monster:
-        cleaned['languages'] = normalize_languages(monster.get('languages'))
-
-    # Normalize optional list fields
-    if 'trait' in monster:
-        cleaned['trait'] = normalize_optional_list_field(monster.get('trait'))
-
-    if 'action' in monster:
-        cleaned['action'] = normalize_optional_list_field(monster.get('action'))
+    return cleaned
 
-    if 'reaction' in monster:
-        cleaned['reaction'] = normalize_optional_list_field(monster.get('reaction'))
 
-    if 'legendary' in monster:
-        cleaned['legendary'] = normalize_optional_list_field(monster.get('legendary'))
+def _process_file(json_file: str) -> Tuple[int, Optional[Dict], bytes]:
+    """
+    Clean every monster in one bestiary file (runs in a worker process).
 
-    if 'spellcasting' in monster:
-        cleaned['spellcasting'] = normalize_optional_list_field(monster.get('spellcasting'))
+    Records are serialized here rather than returned as dicts: the encoded
+    bytes are a fraction of the size of the cleaned dicts, so neither the
+    result pickling nor the parent's accumulated output holds dict trees.
 
-    # Normalize group
-    if 'group' in monster:
-        cleaned['group'] = normalize_group(monster.get('group'))
+    Args:
+        json_file: Path to a bestiary-*.json file (a plain str, which
+            pickles more cheaply than a Path)
 
-    # Normalize shortName
-    if 'shortName' in monster:
-        cleaned['shortName'] = normalize_short_name(monster.get('shortName'))
+    Returns:
+        (monster count, first cleaned monster, encode_records() body);
+        monsters cleaned before an error are kept
+    """
+    file_name = os.path.basename(json_file)
+    print(f"  Processing {file_name}...")
 
-    # Normalize gear
-    if 'gear' in monster:
-        cleaned['gear'] = normalize_gear(monster.get('gear'))
+    file_monsters = []
+    try:
+        for monster in iter_records(json_file, 'monster'):
+            file_monsters.append(clean_monster(monster))
 
-    # Remove _copy field entirely - it's metadata we don't need
-    if '_copy' in cleaned:
-        del cleaned['_copy']
+    except Exception as e:
+        print(f"    ⚠️  Error processing {file_name}: {e}")
 
-    return cleaned
+    return len(file_monsters), file_monsters[0] if file_monsters else None, encode_records(file_monsters)
 
 
 def main():
@@ -440,46 +414,49 @@ def main():
     print("5etools Monster Data Cleaning")
     print("=" * 60)
 
-    all_monsters = []
-
-    if not DATA_DIR.exists():
+    total_monsters = 0
+    sample = None
+    bodies = []
+    source_index = {}
+
+    # Process all bestiary files (scandir's DirEntry caches name and file
+    # type, so no Path objects or extra stat calls per directory entry)
+    try:
+        with os.scandir(DATA_DIR) as entries:
+            json_files = sorted(
+                entry.path for entry in entries
+                if entry.name.startswith('bestiary-') and entry.name.endswith('.json') and entry.is_file()
+            )
+    except FileNotFoundError:
         print(f"❌ Error: {DATA_DIR} not found!")
         return
 
-    # Process all bestiary files
-    json_files = sorted(DATA_DIR.glob('bestiary-*.json'))
     print(f"\n📖 Found {len(json_files)} bestiary files")
 
-    for json_file in json_files:
-        print(f"  Processing {json_file.name}...")
-
-        try:
-            with open(json_file, 'r', encoding='utf-8') as f:
-                data = json.load(f)
-                monsters = data.get('monster', [])
-
-                for monster in monsters:
-                    cleaned = clean_monster(monster)
-                    cleaned['_source_file'] = json_file.name
-                    all_monsters.append(cleaned)
-
-        except Exception as e:
-            print(f"    ⚠️  Error processing {json_file.name}: {e}")
+    # Files are independent: clean them on all cores, keeping file order
+    with ProcessPoolExecutor() as executor:
+        results = executor.map(_process_file, json_files, chunksize=1)
+        for json_file, (count, first, body) in zip(json_files, results):
+            source_index[os.path.basename(json_file)] = [total_monsters, total_monsters + count]
+            total_monsters += count
+            sample = sample or first
+            bodies.append(body)
 
     # Save cleaned data
-    print(f"\n💾 Saving {len(all_monsters)} cleaned monsters...")
+    print(f"\n💾 Saving {total_monsters} cleaned monsters...")
     OUTPUT_FILE.parent.mkdir(parents=True, exist_ok=True)
 
-    with open(OUTPUT_FILE, 'w', encoding='utf-8') as f:
-        json.dump(all_monsters, f, indent=2)
+    # One compact record per line (still a JSON array for the extract/import scripts)
+    write_json_array(bodies, OUTPUT_FILE)
+    # Source file of each record, as index ranges instead of a per-record field
+    dump_json(source_index, SOURCE_INDEX_FILE)
 
     print(f"✅ Cleaned monsters saved to: {OUTPUT_FILE}")
-    print(f"📊 Total monsters: {len(all_monsters)}")
+    print(f"📊 Total monsters: {total_monsters}")
 
     # Show sample
     print("\n📋 Sample cleaned monster:")
-    if all_monsters:
-        sample = all_monsters[0]
+    if sample:
         print(f"  Name: {sample.get('name')}")
         print(f"  Type: {sample.get('type')}")
         print(f"  Size: {sample.get('size')}")
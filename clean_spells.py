@@ -4,13 +4,44 @@ Clean and normalize spell data from 5etools.
 Eliminates polymorphic fields and ensures consistent data structure.
 """
 
-import json
+import sys
+from concurrent.futures import ProcessPoolExecutor
 from pathlib import Path
-from typing import Any, Dict, List
+from typing import Any, Dict, List, Optional, Tuple
+
+from json_helpers import dump_json, encode_records, iter_records, prefetch_files, write_json_array
 
 
 DATA_DIR = Path('/home/ctabone/dnd_bot/5etools-src-2.15.0/data/spells')
 OUTPUT_FILE = Path('cleaned_data/spells.json')
+# Record index range [start, end) of each source file within OUTPUT_FILE
+SOURCE_INDEX_FILE = Path('cleaned_data/spells_source_index.json')
+
+# Type checks below use exact type() identity rather than isinstance:
+# records come straight from the JSON parser, which only ever yields the
+# builtin dict/list/str types (never subclasses), so no MRO walk is needed.
+
+# Shared results for missing/unusable time, range, duration and components.
+# Returned as-is rather than rebuilt per spell: cleaned records are only
+# serialized, never mutated, so sharing one dict is safe.
+_DEFAULT_TIME = {"number": 1, "unit": "action"}
+_DEFAULT_RANGE = {"type": "self", "value": 0, "unit": ""}
+_DEFAULT_DURATION = {"type": "instant", "value": 0, "unit": "", "concentration": False}
+_DEFAULT_COMPONENTS = {"v": False, "s": False, "m": False, "m_text": ""}
+
+# Range and duration types that carry no distance/time amount
+_UNMEASURED_RANGE_TYPES = frozenset({'self', 'touch', 'sight', 'unlimited', 'special'})
+_UNTIMED_DURATION_TYPES = frozenset({'instant', 'permanent', 'special'})
+
+
+def _intern_str(value: Any) -> Any:
+    """
+    Intern value if it is a string.
+
+    Used for the small unit/type vocabularies (feet, minute, point, timed,
+    ...) so every spell shares one string object per distinct value.
+    """
+    return sys.intern(value) if type(value) is str else value
 
 
 def normalize_time(time_data: Any) -> Dict[str, Any]:
@@ -20,17 +51,19 @@ def normalize_time(time_data: Any) -> Dict[str, Any]:
     Input: [{"number": 1, "unit": "action"}]
     Output: {"number": 1, "unit": "action"}
     """
-    if not time_data or not isinstance(time_data, list) or len(time_data) == 0:
-        return {"number": 1, "unit": "action"}
+    if type(time_data) is not list or not time_data:
+        return _DEFAULT_TIME
 
     first = time_data[0]
-    if isinstance(first, dict):
-        return {
-            "number": first.get('number', 1),
-            "unit": first.get('unit', 'action')
-        }
+    if type(first) is dict:
+        number = first.get('number', 1)
+        unit = first.get('unit', 'action')
+        # Fast path: most spells take one action and share the default
+        if unit == 'action' and number == 1 and type(number) is int:
+            return _DEFAULT_TIME
+        return {"number": number, "unit": _intern_str(unit)}
 
-    return {"number": 1, "unit": "action"}
+    return _DEFAULT_TIME
 
 
 def normalize_range(range_data: Any) -> Dict[str, Any]:
@@ -40,22 +73,22 @@ def normalize_range(range_data: Any) -> Dict[str, Any]:
     Input: {"type": "point", "distance": {"type": "feet", "amount": 150}}
     Output: {"type": "point", "value": 150, "unit": "feet"}
     """
-    if not range_data or not isinstance(range_data, dict):
-        return {"type": "self", "value": 0, "unit": ""}
+    if type(range_data) is not dict or not range_data:
+        return _DEFAULT_RANGE
 
-    range_type = range_data.get('type', 'self')
+    range_type = _intern_str(range_data.get('type', 'self'))
 
     # Handle special range types
-    if range_type in ['self', 'touch', 'sight', 'unlimited', 'special']:
+    if type(range_type) is str and range_type in _UNMEASURED_RANGE_TYPES:
         return {"type": range_type, "value": 0, "unit": ""}
 
     # Handle distance-based range
     distance = range_data.get('distance', {})
-    if isinstance(distance, dict):
+    if type(distance) is dict:
         return {
             "type": range_type,
             "value": distance.get('amount', 0),
-            "unit": distance.get('type', 'feet')
+            "unit": _intern_str(distance.get('type', 'feet'))
         }
 
     return {"type": range_type, "value": 0, "unit": ""}
@@ -68,18 +101,21 @@ def normalize_duration(duration_data: Any) -> Dict[str, Any]:
     Input: [{"type": "timed", "duration": {"type": "minute", "amount": 1}, "concentration": true}]
     Output: {"type": "timed", "value": 1, "unit": "minute", "concentration": true}
     """
-    if not duration_data or not isinstance(duration_data, list) or len(duration_data) == 0:
-        return {"type": "instant", "value": 0, "unit": "", "concentration": False}
+    if type(duration_data) is not list or not duration_data:
+        return _DEFAULT_DURATION
 
     first = duration_data[0]
-    if not isinstance(first, dict):
-        return {"type": "instant", "value": 0, "unit": "", "concentration": False}
+    if type(first) is not dict:
+        return _DEFAULT_DURATION
 
-    duration_type = first.get('type', 'instant')
+    duration_type = _intern_str(first.get('type', 'instant'))
     concentration = first.get('concentration', False)
 
     # Handle instant/permanent
-    if duration_type in ['instant', 'permanent', 'special']:
+    if type(duration_type) is str and duration_type in _UNTIMED_DURATION_TYPES:
+        # Fast path: plain instantaneous spells share the default
+        if duration_type == 'instant' and concentration is False:
+            return _DEFAULT_DURATION
         return {
             "type": duration_type,
             "value": 0,
@@ -89,11 +125,11 @@ def normalize_duration(duration_data: Any) -> Dict[str, Any]:
 
     # Handle timed duration
     duration = first.get('duration', {})
-    if isinstance(duration, dict):
+    if type(duration) is dict:
         return {
             "type": duration_type,
             "value": duration.get('amount', 0),
-            "unit": duration.get('type', ''),
+            "unit": _intern_str(duration.get('type', '')),
             "concentration": concentration
         }
 
@@ -107,16 +143,16 @@ def normalize_components(components_data: Any) -> Dict[str, Any]:
     Input: {"v": true, "s": true, "m": "bat guano and sulfur"}
     Output: {"v": true, "s": true, "m": true, "m_text": "bat guano and sulfur"}
     """
-    if not components_data or not isinstance(components_data, dict):
-        return {"v": False, "s": False, "m": False, "m_text": ""}
+    if type(components_data) is not dict or not components_data:
+        return _DEFAULT_COMPONENTS
 
     material_data = components_data.get('m')
     has_material = bool(material_data)
     material_text = ""
 
-    if isinstance(material_data, str):
+    if type(material_data) is str:
         material_text = material_data
-    elif isinstance(material_data, dict):
+    elif type(material_data) is dict:
         material_text = material_data.get('text', '')
 
     return {
@@ -136,22 +172,31 @@ def flatten_entries(entries: Any) -> List[str]:
     if not entries:
         return []
 
-    if isinstance(entries, str):
+    if type(entries) is str:
         return [entries]
 
-    if isinstance(entries, list):
+    if type(entries) is list:
         text_parts = []
-        for entry in entries:
-            if isinstance(entry, str):
+        # Depth-first walk with an explicit stack; lists are pushed in
+        # reverse so entries pop in document order
+        stack = entries[::-1]
+        while stack:
+            entry = stack.pop()
+            if type(entry) is str:
                 text_parts.append(entry)
-            elif isinstance(entry, dict):
+            elif type(entry) is dict:
                 # Extract text from nested structures
                 if 'entries' in entry:
-                    nested_text = flatten_entries(entry['entries'])
-                    text_parts.extend(nested_text)
+                    nested = entry['entries']
                 elif 'items' in entry:
-                    nested_text = flatten_entries(entry['items'])
-                    text_parts.extend(nested_text)
+                    nested = entry['items']
+                else:
+                    continue
+
+                if type(nested) is list:
+                    stack.extend(nested[::-1])
+                elif type(nested) is str and nested:
+                    text_parts.append(nested)
 
         return text_parts
 
@@ -168,10 +213,10 @@ def normalize_scaling_level_dice(scaling: Any) -> List[Dict[str, Any]]:
     if not scaling:
         return []
 
-    if isinstance(scaling, list):
+    if type(scaling) is list:
         return scaling
 
-    if isinstance(scaling, dict):
+    if type(scaling) is dict:
         # Convert single dict to array
         return [scaling]
 
@@ -187,63 +232,99 @@ def normalize_srd_field(srd_value: Any) -> bool:
     """
     if isinstance(srd_value, bool):
         return srd_value
-    if isinstance(srd_value, str):
+    if type(srd_value) is str:
         return True  # If it has a string value, it's in SRD
     return False
 
 
-def clean_spell(spell: Dict) -> Dict:
-    """Clean a single spell record."""
-    cleaned = spell.copy()
+# Sentinel for "key not present" (None is a legitimate field value)
+_MISSING = object()
+
+# Normalizers for optional one-field keys, applied only when present
+_SPELL_NORMALIZERS = {
+    'entries': flatten_entries,
+    'scalingLevelDice': normalize_scaling_level_dice,
+    'srd': normalize_srd_field,
+    'srd52': normalize_srd_field,
+}
+_SPELL_OPTIONAL_KEYS = frozenset(_SPELL_NORMALIZERS)
 
-    # Normalize casting time
-    cleaned['time'] = normalize_time(spell.get('time'))
 
-    # Normalize range
-    cleaned['range'] = normalize_range(spell.get('range'))
+def clean_spell(spell: Dict) -> Dict:
+    """
+    Clean a single spell record.
+
+    The record is normalized in place and returned: spells come straight
+    from the parser and are owned by the caller, so copying them first
+    would only double the dict work. Key order matches the source.
 
-    # Normalize duration
-    cleaned['duration'] = normalize_duration(spell.get('duration'))
+    Spells are kept as plain dicts rather than decoded into a fixed typed
+    schema: every source key, known or not, must reach the JSONB data
+    column on import.
+    """
+    cleaned = spell
 
-    # Normalize components
-    cleaned['components'] = normalize_components(spell.get('components'))
+    # Fields every cleaned spell has (normalized from None if absent),
+    # merged in with one update (dict |= would need Python 3.9)
+    cleaned.update({
+        'time': normalize_time(spell.get('time')),
+        'range': normalize_range(spell.get('range')),
+        'duration': normalize_duration(spell.get('duration')),
+        'components': normalize_components(spell.get('components')),
+    })
 
-    # Flatten description - now returns array of strings
-    if 'entries' in spell:
-        cleaned['entries'] = flatten_entries(spell.get('entries'))
+    # Optional fields: one set intersection finds the keys this spell has
+    for key in spell.keys() & _SPELL_OPTIONAL_KEYS:
+        cleaned[key] = _SPELL_NORMALIZERS[key](spell[key])
 
     # Flatten higher level text
-    if 'entriesHigherLevel' in spell:
-        higher = spell.get('entriesHigherLevel', [])
-        if higher and isinstance(higher, list):
-            cleaned['entriesHigherLevel'] = flatten_entries(higher)
+    higher = spell.get('entriesHigherLevel')
+    if higher and type(higher) is list:
+        cleaned['entriesHigherLevel'] = flatten_entries(higher)
 
     # Ensure damageInflict is array
-    if 'damageInflict' in spell:
-        damage = spell.get('damageInflict')
-        if isinstance(damage, list):
+    damage = spell.get('damageInflict', _MISSING)
+    if damage is not _MISSING:
+        if type(damage) is list:
             cleaned['damageInflict'] = damage
-        elif isinstance(damage, str):
+        elif type(damage) is str:
             cleaned['damageInflict'] = [damage]
         else:
             cleaned['damageInflict'] = []
 
     # Clean school (remove source suffix)
-    if 'school' in cleaned and isinstance(cleaned['school'], str) and '|' in cleaned['school']:
-        cleaned['school'] = cleaned['school'].split('|')[0]
+    school = spell.get('school')
+    if type(school) is str and '|' in school:
+        cleaned['school'] = school.partition('|')[0]
+
+    return cleaned
 
-    # Normalize scalingLevelDice
-    if 'scalingLevelDice' in spell:
-        cleaned['scalingLevelDice'] = normalize_scaling_level_dice(spell.get('scalingLevelDice'))
 
-    # Normalize SRD fields
-    if 'srd' in spell:
-        cleaned['srd'] = normalize_srd_field(spell['srd'])
+def _process_file(json_file: Path) -> Tuple[int, Optional[Dict], bytes]:
+    """
+    Clean every spell in one spell file (runs in a worker process).
 
-    if 'srd52' in spell:
-        cleaned['srd52'] = normalize_srd_field(spell['srd52'])
+    Records are serialized here rather than returned as dicts, so the
+    parent only ever holds compact encoded bytes.
 
-    return cleaned
+    Args:
+        json_file: Path to a spells-*.json file
+
+    Returns:
+        (spell count, first cleaned spell, encode_records() body); spells
+        cleaned before an error are kept
+    """
+    print(f"  Processing {json_file.name}...")
+
+    file_spells = []
+    try:
+        for spell in iter_records(json_file, 'spell'):
+            file_spells.append(clean_spell(spell))
+
+    except Exception as e:
+        print(f"    ⚠️  Error processing {json_file.name}: {e}")
+
+    return len(file_spells), file_spells[0] if file_spells else None, encode_records(file_spells)
 
 
 def main():
@@ -252,8 +333,6 @@ def main():
     print("5etools Spell Data Cleaning")
     print("=" * 60)
 
-    all_spells = []
-
     if not DATA_DIR.exists():
         print(f"❌ Error: {DATA_DIR} not found!")
         return
@@ -262,36 +341,49 @@ def main():
     json_files = sorted(DATA_DIR.glob('spells-*.json'))
     print(f"\n📖 Found {len(json_files)} spell files")
 
-    for json_file in json_files:
-        print(f"  Processing {json_file.name}...")
+    # Start disk readahead for every file up front so workers overlap
+    # their parsing with the remaining I/O
+    prefetch_files(json_files)
 
-        try:
-            with open(json_file, 'r', encoding='utf-8') as f:
-                data = json.load(f)
-                spells = data.get('spell', [])
+    # Spell count and first cleaned spell of each file, filled in as the
+    # file's body is written
+    file_stats = []
 
-                for spell in spells:
-                    cleaned = clean_spell(spell)
-                    cleaned['_source_file'] = json_file.name
-                    all_spells.append(cleaned)
+    def written_bodies(results):
+        for count, first, body in results:
+            file_stats.append((count, first))
+            yield body
 
-        except Exception as e:
-            print(f"    ⚠️  Error processing {json_file.name}: {e}")
-
-    # Save cleaned data
-    print(f"\n💾 Saving {len(all_spells)} cleaned spells...")
     OUTPUT_FILE.parent.mkdir(parents=True, exist_ok=True)
+    print(f"\n🧹 Cleaning and writing {len(json_files)} spell files...")
+
+    # Files are independent: clean them on all cores, keeping file order.
+    # Each file's encoded spells are written (one compact record per line,
+    # still a JSON array for the extract/import scripts) and dropped as
+    # soon as its turn comes, rather than collected for one final write.
+    with ProcessPoolExecutor() as executor:
+        results = executor.map(_process_file, json_files, chunksize=1)
+        write_json_array(written_bodies(results), OUTPUT_FILE)
+
+    total_spells = 0
+    sample = None
+    source_index = {}
+    for json_file, (count, first) in zip(json_files, file_stats):
+        source_index[json_file.name] = [total_spells, total_spells + count]
+        total_spells += count
+        sample = sample or first
+
+    print(f"\n💾 Saving {total_spells} cleaned spells...")
 
-    with open(OUTPUT_FILE, 'w', encoding='utf-8') as f:
-        json.dump(all_spells, f, indent=2)
+    # Source file of each record, as index ranges instead of a per-record field
+    dump_json(source_index, SOURCE_INDEX_FILE)
 
     print(f"✅ Cleaned spells saved to: {OUTPUT_FILE}")
-    print(f"📊 Total spells: {len(all_spells)}")
+    print(f"📊 Total spells: {total_spells}")
 
     # Show sample
     print("\n📋 Sample cleaned spell:")
-    if all_spells:
-        sample = all_spells[0]
+    if sample:
         print(f"  Name: {sample.get('name')}")
         print(f"  Level: {sample.get('level')}")
         print(f"  School: {sample.get('school')}")
@@ -1,34 +1,42 @@
 #!/usr/bin/env python3
-import json
+from pathlib import Path
 
-# Load files
-cond = json.load(open('extraction_data/conditions_extracted.json'))
-dmg = json.load(open('extraction_data/damage_extracted.json'))
-xref = json.load(open('extraction_data/cross_refs_extracted.json'))
+from json_helpers import count_array_items
+
+# Only list lengths are needed, so count them without keeping the parsed data
+cond = count_array_items(Path('extraction_data/conditions_extracted.json'))
+dmg = count_array_items(Path('extraction_data/damage_extracted.json'))
+xref = count_array_items(Path('extraction_data/cross_refs_extracted.json'))
+
+cond_counts = [('Items', cond["items"]),
+               ('Monsters', cond["monsters"]),
+               ('Spells', cond["spells"])]
+dmg_counts = [('Items', dmg["items"]),
+              ('Monster Attacks', dmg["monster_attacks"]),
+              ('Spells', dmg["spells"])]
+xref_counts = list(xref.items())
+
+total_cond = sum(n for _, n in cond_counts)
+total_dmg = sum(n for _, n in dmg_counts)
+total_xref = sum(n for _, n in xref_counts)
 
 print('Conditions by entity:')
-print(f'  Items: {len(cond["items"])}')
-print(f'  Monsters: {len(cond["monsters"])}')
-print(f'  Spells: {len(cond["spells"])}')
-print(f'  Total: {len(cond["items"]) + len(cond["monsters"]) + len(cond["spells"])}')
+for label, n in cond_counts:
+    print(f'  {label}: {n}')
+print(f'  Total: {total_cond}')
 print()
 
 print('Damage by entity:')
-print(f'  Items: {len(dmg["items"])}')
-print(f'  Monster Attacks: {len(dmg["monster_attacks"])}')
-print(f'  Spells: {len(dmg["spells"])}')
-print(f'  Total: {len(dmg["items"]) + len(dmg["monster_attacks"]) + len(dmg["spells"])}')
+for label, n in dmg_counts:
+    print(f'  {label}: {n}')
+print(f'  Total: {total_dmg}')
 print()
 
 print('Cross-refs by type:')
-for k, v in xref.items():
-    print(f'  {k}: {len(v)}')
-
-total_xref = sum(len(v) for v in xref.values())
+for k, n in xref_counts:
+    print(f'  {k}: {n}')
 print(f'  Total: {total_xref}')
 print()
 
-total_all = (len(cond["items"]) + len(cond["monsters"]) + len(cond["spells"]) +
-             len(dmg["items"]) + len(dmg["monster_attacks"]) + len(dmg["spells"]) +
-             total_xref)
+total_all = total_cond + total_dmg + total_xref
 print(f'GRAND TOTAL: {total_all} relationships')
@@ -6,37 +6,59 @@ Shared utility functions for all import scripts.
 Provides database connection, lookup functions, and common operations.
 
 Usage:
-    from db_helpers import get_connection, lookup_source, lookup_or_create
+    from db_helpers import get_connection, return_connection, close_pool, lookup_source, lookup_or_create
+    from db_helpers import preload_all_lookups, discard_uncommitted_lookups, create_missing_item_codes
+    from db_helpers import batch_insert
 """
 
+import atexit
+import io
+import re
+import threading
+import weakref
 import psycopg2
 from psycopg2.extras import execute_values
-from typing import Optional, Dict, Any, List, Tuple
+from psycopg2.pool import ThreadedConnectionPool
+from typing import Optional, Dict, Any, Iterable, List, Tuple
 import sys
 
 # Database connection parameters
 # Note: Run import scripts with sudo -u postgres to use peer authentication
 DB_PARAMS = {
     'dbname': 'dnd5e_reference',
+    # Set search_path to ensure we can see tables; sent in the startup
+    # packet, so it costs no extra round-trip
+    'options': '-c search_path=public',
 }
 
 
+# Connection pool limits (see get_connection)
+POOL_MIN_CONNECTIONS = 1
+POOL_MAX_CONNECTIONS = 8
+
+_POOL: Optional[ThreadedConnectionPool] = None
+
+
 def get_connection():
     """
     Get a database connection using peer authentication.
 
+    Connections come from a process-wide pool, created on first use, so
+    repeated get_connection/return_connection pairs reuse an already
+    authenticated session. Hand connections back with return_connection;
+    the pool itself is closed by close_pool, which runs at exit.
+
     Must be run as postgres user: sudo -u postgres python3 script.py
 
     Returns:
         psycopg2.connection: Database connection
     """
+    global _POOL
     try:
-        conn = psycopg2.connect(**DB_PARAMS)
-        # Set search_path to ensure we can see tables
-        with conn.cursor() as cur:
-            cur.execute("SET search_path TO public;")
-        conn.commit()
-        return conn
+        if _POOL is None:
+            _POOL = ThreadedConnectionPool(POOL_MIN_CONNECTIONS, POOL_MAX_CONNECTIONS, **DB_PARAMS)
+            atexit.register(close_pool)
+        return _POOL.getconn()
     except psycopg2.OperationalError as e:
         print(f"❌ Database connection failed: {e}")
         print("💡 Hint: Run this script as postgres user:")
@@ -44,18 +66,169 @@ def get_connection():
         sys.exit(1)
 
 
-# Cache for lookup tables to avoid repeated queries
+def return_connection(conn):
+    """
+    Return a connection from get_connection to the pool.
+
+    Any open transaction is rolled back by the pool; commit first.
+
+    Args:
+        conn: Connection obtained from get_connection
+    """
+    _POOL.putconn(conn)
+
+
+def close_pool():
+    """
+    Close every pooled connection and drop the pool.
+
+    Registered with atexit when the pool is created; safe to call more
+    than once. A later get_connection creates a fresh pool.
+    """
+    global _POOL
+    if _POOL is not None:
+        _POOL.closeall()
+        _POOL = None
+
+
+# Cache for lookup tables to avoid repeated queries. Each table's dict is
+# built in full and then published with a single assignment, so readers
+# never need the lock and never see a half-filled table. The tables that
+# lookup_or_create_* fill incrementally are created with an atomic
+# setdefault so concurrent first calls share one dict.
 _LOOKUP_CACHE: Dict[str, Dict[str, int]] = {}
+_CACHE_LOCK = threading.Lock()
+
+
+# Backslash escapes emitted by COPY ... TO STDOUT in text format
+_COPY_TEXT_ESCAPES = {
+    'b': '\b', 'f': '\f', 'n': '\n', 'r': '\r', 't': '\t', 'v': '\v', '\\': '\\',
+}
+_COPY_TEXT_ESCAPE_RE = re.compile(r'\\(.)')
+
+
+def _unescape_copy_text(value: str) -> Optional[str]:
+    """Decode one COPY text-format field (\\N is NULL)."""
+    if value == '\\N':
+        return None
+    if '\\' not in value:
+        return value
+    return _COPY_TEXT_ESCAPE_RE.sub(lambda m: _COPY_TEXT_ESCAPES.get(m[1], m[1]), value)
+
+
+# Inverse of _COPY_TEXT_ESCAPES, for writing COPY ... FROM STDIN input
+_COPY_TEXT_ENCODE = str.maketrans({char: '\\' + code for code, char in _COPY_TEXT_ESCAPES.items()})
+
+
+def _escape_copy_text(value: str) -> str:
+    """Encode one COPY text-format field."""
+    return value.translate(_COPY_TEXT_ENCODE)
+
+
+def _copy_rows(conn, query: str) -> List[List[Optional[str]]]:
+    """
+    Run query through COPY ... TO STDOUT and return its rows as text fields.
+
+    COPY skips psycopg2's per-row tuple decoding; fields are split by hand
+    with NULLs as None.
+    """
+    buf = io.StringIO()
+    with conn.cursor() as cur:
+        cur.copy_expert(f"COPY ({query}) TO STDOUT", buf)
+    # Rows end in '\n'; embedded newlines/tabs arrive escaped
+    return [
+        [_unescape_copy_text(field) for field in line.split('\t')]
+        for line in buf.getvalue().split('\n')[:-1]
+    ]
+
+
+# Lookup tables read by the lookup_* functions, with their key column
+_LOOKUP_TABLES = {
+    'sources': 'code',
+    'item_rarities': 'name',
+    'damage_types': 'name',
+    'condition_types': 'name',
+    'creature_types': 'name',
+    'creature_sizes': 'code',
+    'spell_schools': 'code',
+    'alignment_values': 'code',
+    'skills': 'name',
+    'attack_types': 'code',
+}
+
+# Every lookup table in one query: (table, id, key) rows
+_PRELOAD_LOOKUPS_SQL = ' UNION ALL '.join(
+    f"SELECT '{table}', id, {key_column}::text FROM {table}"
+    for table, key_column in _LOOKUP_TABLES.items()
+)
+
+
+def _fill_lookup_cache(cache: Dict[str, int], rows: List[Tuple[int, str]]):
+    """
+    Fill a lookup cache from (id, key) rows.
+
+    Keys are stored lowercased, as before, and also in their stored case
+    when that maps to the same id, so lookup_* can try the caller's string
+    as-is and only lowercase it on a miss. Both forms always agree.
+    """
+    for row_id, key in rows:
+        cache[key.lower()] = row_id
+    for row_id, key in rows:
+        if cache[key.lower()] == row_id:
+            cache.setdefault(key, row_id)
+
+
+def preload_all_lookups(conn):
+    """
+    Load every lookup table into the cache in a single round-trip.
+
+    Called on the first lookup_* call, so imports pay one query for all
+    lookup tables instead of one per table. Tables already cached are
+    left as they are.
+
+    Args:
+        conn: Database connection
+    """
+    if all(table in _LOOKUP_CACHE for table in _LOOKUP_TABLES):
+        return
+
+    with _CACHE_LOCK:
+        # Another thread may have loaded them while we waited
+        missing = [table for table in _LOOKUP_TABLES if table not in _LOOKUP_CACHE]
+        if not missing:
+            return
+
+        rows = {table: [] for table in missing}
+        for table, row_id, key_value in _copy_rows(conn, _PRELOAD_LOOKUPS_SQL):
+            if table in rows:
+                rows[table].append((int(row_id), str(key_value)))
+
+        for table, table_rows in rows.items():
+            cache = {}
+            _fill_lookup_cache(cache, table_rows)
+            _LOOKUP_CACHE[table] = cache
 
 
 def _load_lookup_cache(conn, table: str, key_column: str):
-    """Load entire lookup table into cache."""
+    """
+    Load entire lookup table into cache.
+
+    The lookup_* functions read _LOOKUP_CACHE directly and only call this
+    on a miss, which saves a function call per lookup once loaded.
+    """
     if table not in _LOOKUP_CACHE:
-        _LOOKUP_CACHE[table] = {}
-        with conn.cursor() as cur:
-            cur.execute(f"SELECT id, {key_column} FROM {table}")
-            for row_id, key_value in cur.fetchall():
-                _LOOKUP_CACHE[table][str(key_value).lower()] = row_id
+        if table in _LOOKUP_TABLES:
+            preload_all_lookups(conn)
+        else:
+            with _CACHE_LOCK:
+                if table not in _LOOKUP_CACHE:
+                    rows = _copy_rows(conn, f"SELECT id, {key_column} FROM {table}")
+                    cache = {}
+                    _fill_lookup_cache(
+                        cache,
+                        [(int(row_id), str(key_value)) for row_id, key_value in rows]
+                    )
+                    _LOOKUP_CACHE[table] = cache
     return _LOOKUP_CACHE[table]
 
 
@@ -70,8 +243,9 @@ def lookup_source(conn, source_code: str) -> Optional[int]:
     Returns:
         Source ID or None if not found
     """
-    cache = _load_lookup_cache(conn, 'sources', 'code')
-    return cache.get(source_code.lower())
+    cache = _LOOKUP_CACHE.get('sources') or _load_lookup_cache(conn, 'sources', 'code')
+    row_id = cache.get(source_code)
+    return row_id if row_id is not None else cache.get(source_code.lower())
 
 
 def lookup_rarity(conn, rarity_name: str) -> Optional[int]:
@@ -85,8 +259,9 @@ def lookup_rarity(conn, rarity_name: str) -> Optional[int]:
     Returns:
         Rarity ID or None if not found
     """
-    cache = _load_lookup_cache(conn, 'item_rarities', 'name')
-    return cache.get(rarity_name.lower())
+    cache = _LOOKUP_CACHE.get('item_rarities') or _load_lookup_cache(conn, 'item_rarities', 'name')
+    row_id = cache.get(rarity_name)
+    return row_id if row_id is not None else cache.get(rarity_name.lower())
 
 
 def lookup_damage_type(conn, damage_type: str) -> Optional[int]:
@@ -100,8 +275,9 @@ def lookup_damage_type(conn, damage_type: str) -> Optional[int]:
     Returns:
         Damage type ID or None if not found
     """
-    cache = _load_lookup_cache(conn, 'damage_types', 'name')
-    return cache.get(damage_type.lower())
+    cache = _LOOKUP_CACHE.get('damage_types') or _load_lookup_cache(conn, 'damage_types', 'name')
+    row_id = cache.get(damage_type)
+    return row_id if row_id is not None else cache.get(damage_type.lower())
 
 
 def lookup_condition_type(conn, condition_name: str) -> Optional[int]:
@@ -115,8 +291,9 @@ def lookup_condition_type(conn, condition_name: str) -> Optional[int]:
     Returns:
         Condition type ID or None if not found
     """
-    cache = _load_lookup_cache(conn, 'condition_types', 'name')
-    return cache.get(condition_name.lower())
+    cache = _LOOKUP_CACHE.get('condition_types') or _load_lookup_cache(conn, 'condition_types', 'name')
+    row_id = cache.get(condition_name)
+    return row_id if row_id is not None else cache.get(condition_name.lower())
 
 
 def lookup_creature_type(conn, creature_type: str) -> Optional[int]:
@@ -130,8 +307,9 @@ def lookup_creature_type(conn, creature_type: str) -> Optional[int]:
     Returns:
         Creature type ID or None if not found
     """
-    cache = _load_lookup_cache(conn, 'creature_types', 'name')
-    return cache.get(creature_type.lower())
+    cache = _LOOKUP_CACHE.get('creature_types') or _load_lookup_cache(conn, 'creature_types', 'name')
+    row_id = cache.get(creature_type)
+    return row_id if row_id is not None else cache.get(creature_type.lower())
 
 
 def lookup_creature_size(conn, size_code: str) -> Optional[int]:
@@ -145,8 +323,9 @@ def lookup_creature_size(conn, size_code: str) -> Optional[int]:
     Returns:
         Size ID or None if not found
     """
-    cache = _load_lookup_cache(conn, 'creature_sizes', 'code')
-    return cache.get(size_code.lower())
+    cache = _LOOKUP_CACHE.get('creature_sizes') or _load_lookup_cache(conn, 'creature_sizes', 'code')
+    row_id = cache.get(size_code)
+    return row_id if row_id is not None else cache.get(size_code.lower())
 
 
 def lookup_spell_school(conn, school_code: str) -> Optional[int]:
@@ -160,8 +339,9 @@ def lookup_spell_school(conn, school_code: str) -> Optional[int]:
     Returns:
         School ID or None if not found
     """
-    cache = _load_lookup_cache(conn, 'spell_schools', 'code')
-    return cache.get(school_code.lower())
+    cache = _LOOKUP_CACHE.get('spell_schools') or _load_lookup_cache(conn, 'spell_schools', 'code')
+    row_id = cache.get(school_code)
+    return row_id if row_id is not None else cache.get(school_code.lower())
 
 
 def lookup_alignment(conn, alignment_code: str) -> Optional[int]:
@@ -175,8 +355,9 @@ def lookup_alignment(conn, alignment_code: str) -> Optional[int]:
     Returns:
         Alignment ID or None if not found
     """
-    cache = _load_lookup_cache(conn, 'alignment_values', 'code')
-    return cache.get(alignment_code.lower())
+    cache = _LOOKUP_CACHE.get('alignment_values') or _load_lookup_cache(conn, 'alignment_values', 'code')
+    row_id = cache.get(alignment_code)
+    return row_id if row_id is not None else cache.get(alignment_code.lower())
 
 
 def lookup_skill(conn, skill_name: str) -> Optional[int]:
@@ -190,8 +371,9 @@ def lookup_skill(conn, skill_name: str) -> Optional[int]:
     Returns:
         Skill ID or None if not found
     """
-    cache = _load_lookup_cache(conn, 'skills', 'name')
-    return cache.get(skill_name.lower())
+    cache = _LOOKUP_CACHE.get('skills') or _load_lookup_cache(conn, 'skills', 'name')
+    row_id = cache.get(skill_name)
+    return row_id if row_id is not None else cache.get(skill_name.lower())
 
 
 def lookup_attack_type(conn, attack_type_code: str) -> Optional[int]:
@@ -205,8 +387,100 @@ def lookup_attack_type(conn, attack_type_code: str) -> Optional[int]:
     Returns:
         Attack type ID or None if not found
     """
-    cache = _load_lookup_cache(conn, 'attack_types', 'code')
-    return cache.get(attack_type_code.lower())
+    cache = _LOOKUP_CACHE.get('attack_types') or _load_lookup_cache(conn, 'attack_types', 'code')
+    row_id = cache.get(attack_type_code)
+    return row_id if row_id is not None else cache.get(attack_type_code.lower())
+
+
+# Server-side prepared statements for the lookup_or_create_* cache-miss
+# paths, so PostgreSQL parses and plans each query once per connection
+_PREPARED_STATEMENTS = {
+    'lu_item_type': "(text) AS SELECT id FROM item_types WHERE code = $1",
+    'ins_item_type': "(text, text) AS INSERT INTO item_types (code, name) VALUES ($1, $2) RETURNING id",
+    'lu_item_property': "(text) AS SELECT id FROM item_properties WHERE code = $1",
+    'ins_item_property': "(text, text) AS INSERT INTO item_properties (code, name) VALUES ($1, $2) RETURNING id",
+    'lu_creature_type': "(text) AS SELECT id FROM creature_types WHERE name = $1",
+    'ins_creature_type': "(text) AS INSERT INTO creature_types (name) VALUES ($1) RETURNING id",
+    'lu_creature_size': "(text) AS SELECT id FROM creature_sizes WHERE code = $1",
+    'ins_creature_size': "(text, text) AS INSERT INTO creature_sizes (code, name) VALUES ($1, $2) RETURNING id",
+}
+
+# Connections that already have _PREPARED_STATEMENTS (a new connection,
+# e.g. after a reconnect, is prepared again on first use)
+_PREPARED_CONNECTIONS = weakref.WeakSet()
+
+
+def _ensure_prepared(conn):
+    """PREPARE the lookup_or_create_* statements on conn if not done yet."""
+    if conn in _PREPARED_CONNECTIONS:
+        return
+    with conn.cursor() as cur:
+        for name, statement in _PREPARED_STATEMENTS.items():
+            cur.execute(f"PREPARE {name}{statement}")
+    _PREPARED_CONNECTIONS.add(conn)
+
+
+# Cache entries for rows created by lookup_or_create_* that may not be
+# committed yet. Those functions leave committing to the caller's record
+# transaction; if it is rolled back, discard_uncommitted_lookups() drops
+# the now-dangling ids.
+_UNCOMMITTED_LOOKUPS: List[Tuple[str, str]] = []
+
+
+def discard_uncommitted_lookups():
+    """
+    Drop cached ids created since the last discard.
+
+    Call after conn.rollback(). Entries that were in fact committed are
+    simply looked up again on next use.
+    """
+    for table, cache_key in _UNCOMMITTED_LOOKUPS:
+        _LOOKUP_CACHE[table].pop(cache_key, None)
+    _UNCOMMITTED_LOOKUPS.clear()
+
+
+# Default names for item type, item property and creature size codes
+# created by lookup_or_create_*
+_ITEM_TYPE_NAMES = {
+    'M': 'Melee Weapon',
+    'R': 'Ranged Weapon',
+    'A': 'Armor',
+    'LA': 'Light Armor',
+    'MA': 'Medium Armor',
+    'HA': 'Heavy Armor',
+    'S': 'Shield',
+    'G': 'Adventuring Gear',
+    'INS': 'Instrument',
+    'SCF': 'Spellcasting Focus',
+    'T': 'Tool',
+    'P': 'Potion',
+    'RD': 'Rod',
+    'RG': 'Ring',
+    'SC': 'Scroll',
+    'WD': 'Wand',
+}
+
+_ITEM_PROPERTY_NAMES = {
+    'F': 'Finesse',
+    '2H': 'Two-Handed',
+    'V': 'Versatile',
+    'H': 'Heavy',
+    'L': 'Light',
+    'T': 'Thrown',
+    'R': 'Reach',
+    'LD': 'Loading',
+    'A': 'Ammunition',
+    'RLD': 'Reload',
+}
+
+_CREATURE_SIZE_NAMES = {
+    'T': 'Tiny',
+    'S': 'Small',
+    'M': 'Medium',
+    'L': 'Large',
+    'H': 'Huge',
+    'G': 'Gargantuan'
+}
 
 
 def lookup_or_create_item_type(conn, type_code: str, type_name: str = None) -> int:
@@ -215,6 +489,9 @@ def lookup_or_create_item_type(conn, type_code: str, type_name: str = None) -> i
 
     Item types are created dynamically during import since they vary by source.
 
+    New rows are not committed here; the caller commits them with its
+    own transaction (and calls discard_uncommitted_lookups on rollback).
+
     Args:
         conn: Database connection
         type_code: Type code (e.g., "M", "R", "A")
@@ -224,16 +501,16 @@ def lookup_or_create_item_type(conn, type_code: str, type_name: str = None) -> i
         Type ID
     """
     # Check cache first
-    if 'item_types' not in _LOOKUP_CACHE:
-        _LOOKUP_CACHE['item_types'] = {}
+    _LOOKUP_CACHE.setdefault('item_types', {})
 
     cache_key = type_code.lower()
     if cache_key in _LOOKUP_CACHE['item_types']:
         return _LOOKUP_CACHE['item_types'][cache_key]
 
     # Try to find in database
+    _ensure_prepared(conn)
     with conn.cursor() as cur:
-        cur.execute("SELECT id FROM item_types WHERE code = %s", (type_code,))
+        cur.execute("EXECUTE lu_item_type(%s)", (type_code,))
         result = cur.fetchone()
         if result:
             type_id = result[0]
@@ -243,34 +520,13 @@ def lookup_or_create_item_type(conn, type_code: str, type_name: str = None) -> i
     # Create new type
     if type_name is None:
         # Derive name from code
-        type_names = {
-            'M': 'Melee Weapon',
-            'R': 'Ranged Weapon',
-            'A': 'Armor',
-            'LA': 'Light Armor',
-            'MA': 'Medium Armor',
-            'HA': 'Heavy Armor',
-            'S': 'Shield',
-            'G': 'Adventuring Gear',
-            'INS': 'Instrument',
-            'SCF': 'Spellcasting Focus',
-            'T': 'Tool',
-            'P': 'Potion',
-            'RD': 'Rod',
-            'RG': 'Ring',
-            'SC': 'Scroll',
-            'WD': 'Wand',
-        }
-        type_name = type_names.get(type_code, type_code)
+        type_name = _ITEM_TYPE_NAMES.get(type_code, type_code)
 
     with conn.cursor() as cur:
-        cur.execute(
-            "INSERT INTO item_types (code, name) VALUES (%s, %s) RETURNING id",
-            (type_code, type_name)
-        )
+        cur.execute("EXECUTE ins_item_type(%s, %s)", (type_code, type_name))
         type_id = cur.fetchone()[0]
-        conn.commit()
         _LOOKUP_CACHE['item_types'][cache_key] = type_id
+        _UNCOMMITTED_LOOKUPS.append(('item_types', cache_key))
         return type_id
 
 
@@ -278,6 +534,9 @@ def lookup_or_create_item_property(conn, property_code: str, property_name: str
     """
     Lookup or create item property by code.
 
+    New rows are not committed here; the caller commits them with its
+    own transaction (and calls discard_uncommitted_lookups on rollback).
+
     Args:
         conn: Database connection
         property_code: Property code (e.g., "F", "V", "2H")
@@ -287,16 +546,16 @@ def lookup_or_create_item_property(conn, property_code: str, property_name: str
         Property ID
     """
     # Check cache first
-    if 'item_properties' not in _LOOKUP_CACHE:
-        _LOOKUP_CACHE['item_properties'] = {}
+    _LOOKUP_CACHE.setdefault('item_properties', {})
 
     cache_key = property_code.lower()
     if cache_key in _LOOKUP_CACHE['item_properties']:
         return _LOOKUP_CACHE['item_properties'][cache_key]
 
     # Try to find in database
+    _ensure_prepared(conn)
     with conn.cursor() as cur:
-        cur.execute("SELECT id FROM item_properties WHERE code = %s", (property_code,))
+        cur.execute("EXECUTE lu_item_property(%s)", (property_code,))
         result = cur.fetchone()
         if result:
             prop_id = result[0]
@@ -305,35 +564,72 @@ def lookup_or_create_item_property(conn, property_code: str, property_name: str
 
     # Create new property
     if property_name is None:
-        property_names = {
-            'F': 'Finesse',
-            '2H': 'Two-Handed',
-            'V': 'Versatile',
-            'H': 'Heavy',
-            'L': 'Light',
-            'T': 'Thrown',
-            'R': 'Reach',
-            'LD': 'Loading',
-            'A': 'Ammunition',
-            'RLD': 'Reload',
-        }
-        property_name = property_names.get(property_code, property_code)
+        property_name = _ITEM_PROPERTY_NAMES.get(property_code, property_code)
 
     with conn.cursor() as cur:
-        cur.execute(
-            "INSERT INTO item_properties (code, name) VALUES (%s, %s) RETURNING id",
-            (property_code, property_name)
-        )
+        cur.execute("EXECUTE ins_item_property(%s, %s)", (property_code, property_name))
         prop_id = cur.fetchone()[0]
-        conn.commit()
         _LOOKUP_CACHE['item_properties'][cache_key] = prop_id
+        _UNCOMMITTED_LOOKUPS.append(('item_properties', cache_key))
         return prop_id
 
 
+# Default names for the tables create_missing_item_codes can fill
+_ITEM_CODE_NAMES = {
+    'item_types': _ITEM_TYPE_NAMES,
+    'item_properties': _ITEM_PROPERTY_NAMES,
+}
+
+
+def create_missing_item_codes(conn, table: str, codes: Iterable[str]):
+    """
+    Create every missing item type or property code in one COPY and cache all ids.
+
+    Meant to run once before an import loop: a first run against an empty
+    table otherwise pays an INSERT round-trip per new code inside
+    lookup_or_create_item_type/_property. Afterwards those calls are
+    answered from the cache. New rows are committed here.
+
+    If the COPY fails (e.g. a code too long for the column), nothing is
+    created and the codes are left to the per-record path, where only the
+    offending records fail.
+
+    Args:
+        conn: Database connection
+        table: 'item_types' or 'item_properties'
+        codes: Cleaned codes the import will look up (duplicates are fine)
+    """
+    names = _ITEM_CODE_NAMES[table]
+    rows = _copy_rows(conn, f"SELECT id, code FROM {table}")
+    known = {code for _, code in rows}
+    new_codes = sorted({code for code in codes if code and code not in known})
+
+    if new_codes:
+        buf = io.StringIO(''.join(
+            f"{_escape_copy_text(code)}\t{_escape_copy_text(names.get(code, code))}\n"
+            for code in new_codes
+        ))
+        try:
+            with conn.cursor() as cur:
+                cur.copy_expert(f"COPY {table} (code, name) FROM STDIN", buf)
+            conn.commit()
+        except psycopg2.Error as e:
+            conn.rollback()
+            log_warning(f"Bulk create of {len(new_codes)} {table} failed, creating per record: {e}")
+        rows = _copy_rows(conn, f"SELECT id, code FROM {table}")
+
+    cache = _LOOKUP_CACHE.setdefault(table, {})
+    for row_id, code in rows:
+        cache.setdefault(code.lower(), int(row_id))
+
+
 def lookup_or_create_creature_type(conn, type_name: str) -> int:
     """
     Lookup or create creature type by name.
 
+    New rows are not committed here; the caller commits them with its
+    own transaction (and calls discard_uncommitted_lookups on rollback).
+
     Args:
         conn: Database connection
         type_name: Creature type name (e.g., 'humanoid', 'beast', 'dragon')
@@ -341,8 +637,7 @@ def lookup_or_create_creature_type(conn, type_name: str) -> int:
     Returns:
         Creature type ID
     """
-    if 'creature_types' not in _LOOKUP_CACHE:
-        _LOOKUP_CACHE['creature_types'] = {}
+    _LOOKUP_CACHE.setdefault('creature_types', {})
 
     cache_key = type_name.lower()
 
@@ -351,8 +646,9 @@ def lookup_or_create_creature_type(conn, type_name: str) -> int:
         return _LOOKUP_CACHE['creature_types'][cache_key]
 
     # Try to find in database
+    _ensure_prepared(conn)
     with conn.cursor() as cur:
-        cur.execute("SELECT id FROM creature_types WHERE name = %s", (type_name.lower(),))
+        cur.execute("EXECUTE lu_creature_type(%s)", (type_name.lower(),))
         result = cur.fetchone()
         if result:
             type_id = result[0]
@@ -361,13 +657,10 @@ def lookup_or_create_creature_type(conn, type_name: str) -> int:
 
     # Create new creature type
     with conn.cursor() as cur:
-        cur.execute(
-            "INSERT INTO creature_types (name) VALUES (%s) RETURNING id",
-            (type_name.lower(),)
-        )
+        cur.execute("EXECUTE ins_creature_type(%s)", (type_name.lower(),))
         type_id = cur.fetchone()[0]
-        conn.commit()
         _LOOKUP_CACHE['creature_types'][cache_key] = type_id
+        _UNCOMMITTED_LOOKUPS.append(('creature_types', cache_key))
         return type_id
 
 
@@ -375,6 +668,9 @@ def lookup_or_create_creature_size(conn, size_code: str) -> int:
     """
     Lookup or create creature size by code.
 
+    New rows are not committed here; the caller commits them with its
+    own transaction (and calls discard_uncommitted_lookups on rollback).
+
     Args:
         conn: Database connection
         size_code: Size code (T, S, M, L, H, G)
@@ -382,8 +678,7 @@ def lookup_or_create_creature_size(conn, size_code: str) -> int:
     Returns:
         Creature size ID
     """
-    if 'creature_sizes' not in _LOOKUP_CACHE:
-        _LOOKUP_CACHE['creature_sizes'] = {}
+    _LOOKUP_CACHE.setdefault('creature_sizes', {})
 
     cache_key = size_code.lower()
 
@@ -392,8 +687,9 @@ def lookup_or_create_creature_size(conn, size_code: str) -> int:
         return _LOOKUP_CACHE['creature_sizes'][cache_key]
 
     # Try to find in database
+    _ensure_prepared(conn)
     with conn.cursor() as cur:
-        cur.execute("SELECT id FROM creature_sizes WHERE code = %s", (size_code.upper(),))
+        cur.execute("EXECUTE lu_creature_size(%s)", (size_code.upper(),))
         result = cur.fetchone()
         if result:
             size_id = result[0]
@@ -402,24 +698,13 @@ def lookup_or_create_creature_size(conn, size_code: str) -> int:
 
     # Create new size if not found (should not happen with controlled vocab)
     # Map codes to names
-    size_names = {
-        'T': 'Tiny',
-        'S': 'Small',
-        'M': 'Medium',
-        'L': 'Large',
-        'H': 'Huge',
-        'G': 'Gargantuan'
-    }
-    size_name = size_names.get(size_code.upper(), size_code.upper())
+    size_name = _CREATURE_SIZE_NAMES.get(size_code.upper(), size_code.upper())
 
     with conn.cursor() as cur:
-        cur.execute(
-            "INSERT INTO creature_sizes (code, name) VALUES (%s, %s) RETURNING id",
-            (size_code.upper(), size_name)
-        )
+        cur.execute("EXECUTE ins_creature_size(%s, %s)", (size_code.upper(), size_name))
         size_id = cur.fetchone()[0]
-        conn.commit()
         _LOOKUP_CACHE['creature_sizes'][cache_key] = size_id
+        _UNCOMMITTED_LOOKUPS.append(('creature_sizes', cache_key))
         return size_id
 
 
@@ -441,14 +726,33 @@ def clean_type_code(type_code: str) -> str:
     if not type_code:
         return None
 
-    # Remove $ prefix (indicates generic variant)
-    cleaned = type_code.lstrip('$')
-
-    # Remove source suffix (e.g., "|XPHB")
-    if '|' in cleaned:
-        cleaned = cleaned.split('|')[0]
+    # Remove $ prefix (indicates generic variant); most codes have none
+    cleaned = type_code.lstrip('$') if type_code[0] == '$' else type_code
+
+    # Remove source suffix (e.g., "|XPHB"); returns cleaned itself if absent
+    return cleaned.partition('|')[0]
+
+
+# Single-letter damage type codes
+_DAMAGE_CODE_TO_NAME = {
+    'B': 'bludgeoning',
+    'P': 'piercing',
+    'S': 'slashing',
+    'N': 'necrotic',
+    'R': 'radiant',
+    'F': 'fire',
+    'C': 'cold',
+    'L': 'lightning',
+    'T': 'thunder',
+    'A': 'acid',
+    'I': 'poison',
+    'O': 'force',
+    'Y': 'psychic',
+}
 
-    return cleaned
+# Codes in both cases, so expand_damage_type_code needs no upper() call
+_DAMAGE_CODE_LOOKUP = dict(_DAMAGE_CODE_TO_NAME)
+_DAMAGE_CODE_LOOKUP.update((code.lower(), name) for code, name in _DAMAGE_CODE_TO_NAME.items())
 
 
 def expand_damage_type_code(damage_code: str) -> str:
@@ -461,22 +765,23 @@ def expand_damage_type_code(damage_code: str) -> str:
     Returns:
         Full damage type name
     """
-    damage_type_map = {
-        'B': 'bludgeoning',
-        'P': 'piercing',
-        'S': 'slashing',
-        'N': 'necrotic',
-        'R': 'radiant',
-        'F': 'fire',
-        'C': 'cold',
-        'L': 'lightning',
-        'T': 'thunder',
-        'A': 'acid',
-        'I': 'poison',
-        'O': 'force',
-        'Y': 'psychic',
-    }
-    return damage_type_map.get(damage_code.upper(), damage_code.lower())
+    name = _DAMAGE_CODE_LOOKUP.get(damage_code)
+    return name if name is not None else damage_code.lower()
+
+
+# Every standard CR string, precomputed; parse_cr falls back to parsing
+# for anything else.
+# parse_cr/parse_hp/parse_ac/parse_speed/parse_ability_scores stay scalar:
+# import_monsters calls them once per monster right before that monster's
+# INSERT, whose round-trip dwarfs the parsing, so there is no batch to
+# vectorize.
+_CR_TABLE = {
+    '0': 0.0,
+    '1/8': 0.125,
+    '1/4': 0.25,
+    '1/2': 0.5,
+    **{str(cr): float(cr) for cr in range(1, 31)},
+}
 
 
 def parse_cr(cr_value) -> float:
@@ -498,6 +803,10 @@ def parse_cr(cr_value) -> float:
         return float(cr_value)
 
     if isinstance(cr_value, str):
+        cr = _CR_TABLE.get(cr_value)
+        if cr is not None:
+            return cr
+
         # Handle fractional CR
         if '/' in cr_value:
             parts = cr_value.split('/')
@@ -517,10 +826,13 @@ def parse_hp(hp_data) -> tuple:
     Returns:
         Tuple of (average: int, formula: str)
     """
-    if isinstance(hp_data, int):
+    # Parsed JSON only yields exact types, so compare type() directly
+    # rather than walking the MRO with isinstance
+    hp_type = type(hp_data)
+    if hp_type is int:
         return hp_data, None
 
-    if isinstance(hp_data, dict):
+    if hp_type is dict:
         average = hp_data.get('average', 0)
         formula = hp_data.get('formula')
         return average, formula
@@ -538,14 +850,16 @@ def parse_ac(ac_data) -> int:
     Returns:
         Primary AC value as int
     """
-    if isinstance(ac_data, int):
+    ac_type = type(ac_data)
+    if ac_type is int:
         return ac_data
 
-    if isinstance(ac_data, list) and len(ac_data) > 0:
+    if ac_type is list and ac_data:
         first_ac = ac_data[0]
-        if isinstance(first_ac, dict):
+        first_type = type(first_ac)
+        if first_type is dict:
             return first_ac.get('ac', 10)
-        if isinstance(first_ac, int):
+        if first_type is int:
             return first_ac
 
     return 10  # Default AC
@@ -569,11 +883,12 @@ def parse_speed(speed_data) -> dict:
         'burrow': 0
     }
 
-    if isinstance(speed_data, int):
+    speed_type = type(speed_data)
+    if speed_type is int:
         speeds['walk'] = speed_data
         return speeds
 
-    if isinstance(speed_data, dict):
+    if speed_type is dict:
         speeds['walk'] = speed_data.get('walk', 30)
         speeds['fly'] = speed_data.get('fly', 0)
         speeds['swim'] = speed_data.get('swim', 0)
@@ -603,24 +918,29 @@ def parse_ability_scores(monster_data: dict) -> dict:
     }
 
 
-def generate_search_vector(name: str, description: str = None) -> str:
+def generate_search_vector(name: str, description: str = None) -> Tuple[str, tuple]:
     """
-    Generate a tsvector string for full-text search.
+    Build a parameterized tsvector expression for full-text search.
+
+    The values are passed as query parameters rather than inlined into
+    the SQL, so the statement text is the same for every row and can be
+    reused by prepared statements and batch inserts.
 
     Args:
         name: Entity name
         description: Optional description text
 
     Returns:
-        SQL expression for tsvector
+        (SQL expression with %s placeholders, parameter tuple), e.g.
+        ("to_tsvector('english', %s)", ("Fireball",))
     """
     if description:
-        return f"to_tsvector('english', {psycopg2.extensions.adapt(name)} || ' ' || {psycopg2.extensions.adapt(description)})"
+        return "to_tsvector('english', %s || ' ' || %s)", (name, description)
     else:
-        return f"to_tsvector('english', {psycopg2.extensions.adapt(name)})"
+        return "to_tsvector('english', %s)", (name,)
 
 
-def batch_insert(conn, table: str, columns: List[str], values: List[Tuple], batch_size: int = 100):
+def batch_insert(conn, table: str, columns: List[str], values: List[Tuple], batch_size: int = 1000):
     """
     Insert records in batches for better performance.
 
@@ -629,21 +949,21 @@ def batch_insert(conn, table: str, columns: List[str], values: List[Tuple], batc
         table: Table name
         columns: List of column names
         values: List of tuples with values
-        batch_size: Number of records per batch
+        batch_size: Number of records per INSERT statement (execute_values page_size)
     """
     if not values:
         return
 
     column_str = ', '.join(columns)
 
+    # execute_values pages the rows itself: one multi-row INSERT per page
     with conn.cursor() as cur:
-        for i in range(0, len(values), batch_size):
-            batch = values[i:i + batch_size]
-            execute_values(
-                cur,
-                f"INSERT INTO {table} ({column_str}) VALUES %s",
-                batch
-            )
+        execute_values(
+            cur,
+            f"INSERT INTO {table} ({column_str}) VALUES %s",
+            values,
+            page_size=batch_size
+        )
 
     conn.commit()
 
@@ -662,6 +982,33 @@ def log_progress(current: int, total: int, entity_type: str = "records"):
         print(f"  Progress: {current}/{total} {entity_type} ({percentage:.1f}%)")
 
 
+class ProgressLogger:
+    """
+    Progress printer for per-record import loops.
+
+    Call tick() once per record. Prints at the same points as log_progress
+    (every step records and at the end) but compares against the next
+    print threshold instead of taking a modulo on every record.
+    """
+
+    __slots__ = ('current', 'total', 'entity_type', 'step', 'next_log')
+
+    def __init__(self, total: int, entity_type: str = "records", step: int = 100):
+        self.current = 0
+        self.total = total
+        self.entity_type = entity_type
+        self.step = step
+        self.next_log = min(step, total)
+
+    def tick(self):
+        """Count one record, printing progress when a threshold is reached."""
+        self.current += 1
+        if self.current >= self.next_log:
+            log_progress(self.current, self.total, self.entity_type)
+            next_log = self.current + self.step
+            self.next_log = self.total if self.current < self.total < next_log else next_log
+
+
 def log_warning(message: str):
     """Print warning message."""
     print(f"⚠️  WARNING: {message}")
@@ -684,13 +1031,25 @@ def log_info(message: str):
 
 # Statistics tracking
 class ImportStats:
-    """Track import statistics."""
+    """
+    Track import statistics.
+
+    Only the first MAX_MESSAGES warnings and errors are kept (that is all
+    print_summary shows); warning_count/error_count hold the true totals.
+    """
+
+    __slots__ = ('processed', 'succeeded', 'failed', 'skipped',
+                 'warning_count', 'error_count', 'warnings', 'errors')
+
+    MAX_MESSAGES = 10
 
     def __init__(self):
         self.processed = 0
         self.succeeded = 0
         self.failed = 0
         self.skipped = 0
+        self.warning_count = 0
+        self.error_count = 0
         self.warnings = []
         self.errors = []
 
@@ -703,17 +1062,21 @@ class ImportStats:
         """Record failed import."""
         self.processed += 1
         self.failed += 1
-        self.errors.append(error_msg)
+        self.error_count += 1
+        if self.error_count <= self.MAX_MESSAGES:
+            self.errors.append(error_msg)
 
     def record_skip(self, reason: str):
         """Record skipped record."""
         self.processed += 1
         self.skipped += 1
-        self.warnings.append(reason)
+        self.record_warning(reason)
 
     def record_warning(self, warning_msg: str):
         """Record warning."""
-        self.warnings.append(warning_msg)
+        self.warning_count += 1
+        if self.warning_count <= self.MAX_MESSAGES:
+            self.warnings.append(warning_msg)
 
     def print_summary(self):
         """Print import summary."""
@@ -726,18 +1089,18 @@ class ImportStats:
         print(f"❌ Failed: {self.failed}")
 
         if self.warnings:
-            print(f"\n⚠️  Warnings ({len(self.warnings)}):")
-            for i, warning in enumerate(self.warnings[:10], 1):
+            print(f"\n⚠️  Warnings ({self.warning_count}):")
+            for i, warning in enumerate(self.warnings, 1):
                 print(f"  {i}. {warning}")
-            if len(self.warnings) > 10:
-                print(f"  ... and {len(self.warnings) - 10} more")
+            if self.warning_count > len(self.warnings):
+                print(f"  ... and {self.warning_count - len(self.warnings)} more")
 
         if self.errors:
-            print(f"\n❌ Errors ({len(self.errors)}):")
-            for i, error in enumerate(self.errors[:10], 1):
+            print(f"\n❌ Errors ({self.error_count}):")
+            for i, error in enumerate(self.errors, 1):
                 print(f"  {i}. {error}")
-            if len(self.errors) > 10:
-                print(f"  ... and {len(self.errors) - 10} more")
+            if self.error_count > len(self.errors):
+                print(f"  ... and {self.error_count - len(self.errors)} more")
 
         print("=" * 80)
 
@@ -774,7 +1137,7 @@ if __name__ == '__main__':
         assert expand_damage_type_code('F') == 'fire'
         print("✅ Damage type expansion works")
 
-        conn.close()
+        return_connection(conn)
         print("\n✅ All tests passed!")
 
     except Exception as e:
@@ -11,23 +11,39 @@ This script orchestrates the complete extraction pipeline:
 6. extract_cross_refs.py - Extract cross-references
 7. validate_extraction.py - Verify all extraction work
 
+Steps 1-3 rewrite the *_extracted.json files in turn, so they run one
+after another. Steps 4-6 only read those files and each write their own
+output, so they run concurrently; step 7 waits for all of them.
+
 Usage:
-    python3 extract_all.py
+    python3 extract_all.py [--isolate]
+
+Sequential steps run in-process (--isolate runs each in a subprocess).
 """
 
+import argparse
+import importlib
 import subprocess
 import sys
 import time
 from pathlib import Path
 
+import script_helpers
+
 
-def run_script(script_name: str, description: str) -> bool:
+def run_script(script_name: str, description: str, isolate: bool = False) -> bool:
     """
     Run a Python script and return success status.
 
+    By default the script is imported and its main() called in this
+    process, which skips a fresh interpreter start per script. Scripts
+    signal failure by raising, calling sys.exit with a non-zero status,
+    or returning a non-zero int from main().
+
     Args:
         script_name: Name of the script to run
         description: Human-readable description
+        isolate: Run the script in a subprocess instead
 
     Returns:
         True if script succeeded, False otherwise
@@ -37,57 +53,115 @@ def run_script(script_name: str, description: str) -> bool:
     print(f"Script: {script_name}")
     print('=' * 60)
 
-    start_time = time.time()
+    start_time = time.perf_counter()
+    error = None
 
     try:
-        result = subprocess.run(
-            [sys.executable, script_name],
-            capture_output=False,  # Let output go to console
-            text=True,
-            check=True
-        )
-
-        elapsed = time.time() - start_time
+        if isolate:
+            subprocess.run(
+                [sys.executable, script_name],
+                capture_output=False,  # Let output go to console
+                text=True,
+                check=True
+            )
+        else:
+            module = importlib.import_module(Path(script_name).stem)
+            try:
+                exit_code = module.main()
+            except SystemExit as e:
+                exit_code = e.code
+            if exit_code:
+                error = f"exit status {exit_code}"
+
+    except Exception as e:
+        error = e
+
+    elapsed = time.perf_counter() - start_time
+    if error is None:
         print(f"\n✓ Completed in {elapsed:.1f} seconds")
         return True
 
-    except subprocess.CalledProcessError as e:
-        elapsed = time.time() - start_time
-        print(f"\n✗ Failed after {elapsed:.1f} seconds")
-        print(f"Error: {e}")
-        return False
+    print(f"\n✗ Failed after {elapsed:.1f} seconds")
+    print(f"Error: {error}")
+    return False
+
+
+def run_scripts_parallel(scripts) -> dict:
+    """
+    Run independent Python scripts concurrently.
+
+    Each script's output goes to logs/<script>.log so console output
+    doesn't interleave.
+
+    Args:
+        scripts: (script_name, description) pairs
+
+    Returns:
+        Dict mapping script_name -> success, in script order
+    """
+    print(f"\n{'=' * 60}")
+    print("Running in parallel:")
+    for script_name, description in scripts:
+        print(f"  - {description} ({script_name})")
+    print('=' * 60)
+    descriptions = dict(scripts)
+
+    finished = {}
+    for script_name, returncode, elapsed, log_path in script_helpers.run_scripts_parallel(descriptions):
+        description = descriptions[script_name]
+        success = returncode == 0
+        finished[script_name] = success
+        if success:
+            print(f"\n✓ {description} completed in {elapsed:.1f} seconds (log: {log_path})")
+        else:
+            print(f"\n✗ {description} failed after {elapsed:.1f} seconds")
+            print(f"Error: exit status {returncode}, see {log_path}")
+
+    return {script_name: finished[script_name] for script_name, _ in scripts}
 
 
 def main():
     """Run all extraction scripts in order."""
+    parser = argparse.ArgumentParser(description="Run the Phase 0.6 extraction pipeline")
+    parser.add_argument('--isolate', action='store_true',
+                        help="Run every script in its own subprocess instead of in-process")
+    args = parser.parse_args()
+
     print("=" * 60)
     print("Phase 0.6: Complete Extraction Pipeline")
     print("=" * 60)
-    print("\nThis will run all extraction scripts in sequence.")
+    print("\nThis will run all extraction scripts (independent ones in parallel).")
     print("Estimated time: 2-3 minutes")
     print()
 
     start_time = time.time()
 
-    # Define the pipeline
+    # Define the pipeline as stages; scripts within a stage are independent
     pipeline = [
-        ('extract_names.py', 'Extract and clean name fields'),
-        ('normalize_bonuses.py', 'Normalize bonus fields to integers'),
-        ('normalize_type_codes.py', 'Normalize type codes'),
-        ('extract_conditions.py', 'Extract condition references'),
-        ('extract_damage.py', 'Extract damage information'),
-        ('extract_cross_refs.py', 'Extract cross-references'),
-        ('validate_extraction.py', 'Validate all extraction work'),
+        [('extract_names.py', 'Extract and clean name fields')],
+        [('normalize_bonuses.py', 'Normalize bonus fields to integers')],
+        [('normalize_type_codes.py', 'Normalize type codes')],
+        [
+            ('extract_conditions.py', 'Extract condition references'),
+            ('extract_damage.py', 'Extract damage information'),
+            ('extract_cross_refs.py', 'Extract cross-references'),
+        ],
+        [('validate_extraction.py', 'Validate all extraction work')],
     ]
 
-    # Run each script
+    # Run each stage
     results = {}
-    for script_name, description in pipeline:
-        success = run_script(script_name, description)
-        results[script_name] = success
-
-        if not success:
-            print(f"\n❌ Pipeline failed at: {script_name}")
+    for stage in pipeline:
+        if len(stage) == 1:
+            script_name, description = stage[0]
+            stage_results = {script_name: run_script(script_name, description, isolate=args.isolate)}
+        else:
+            stage_results = run_scripts_parallel(stage)
+        results.update(stage_results)
+
+        failed = [script_name for script_name, success in stage_results.items() if not success]
+        if failed:
+            print(f"\n❌ Pipeline failed at: {', '.join(failed)}")
             print("Please fix the errors and run again.")
             return 1
 
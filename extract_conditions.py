@@ -34,12 +34,25 @@ Format:
 }
 """
 
-import json
 import re
-from typing import Dict, Any, List, Optional, Tuple
+from typing import Dict, Any, Iterable, List, Optional, Tuple
 from pathlib import Path
 from collections import defaultdict
 
+from json_helpers import CountedRecords, dump_json, iter_records, map_records
+
+
+# Patterns used for every extracted text, compiled once
+_DC_TAG_RE = re.compile(r'\{@dc (\d+)\}')
+_DC_PLAIN_RE = re.compile(r'\bDC (\d+)\b')
+_SAVE_ABILITIES = ('Strength', 'Dexterity', 'Constitution', 'Intelligence', 'Wisdom', 'Charisma')
+_SAVE_ABILITY_RE = re.compile(
+    rf'\b({"|".join(_SAVE_ABILITIES)})\s+sav(?:ing throw|e)\b', re.IGNORECASE
+)
+_DUR_FOR_RE = re.compile(r'for (\d+\s+(?:round|minute|hour|day)s?)')
+_DUR_UNTIL_RE = re.compile(r'until ([^.;,]+?)(?:[.;,]|$)')
+_CONDITION_TAG_RE = re.compile(r'\{@condition ([^}|]+)(?:\|([^}]+))?\}')
+
 
 def extract_dc(text: str) -> Optional[int]:
     """
@@ -50,12 +63,12 @@ def extract_dc(text: str) -> Optional[int]:
         "DC 13" -> 13
     """
     # Try {@dc X} pattern first
-    match = re.search(r'\{@dc (\d+)\}', text)
+    match = _DC_TAG_RE.search(text)
     if match:
         return int(match.group(1))
 
     # Try plain "DC X" pattern
-    match = re.search(r'\bDC (\d+)\b', text)
+    match = _DC_PLAIN_RE.search(text)
     if match:
         return int(match.group(1))
 
@@ -70,11 +83,14 @@ def extract_save_ability(text: str) -> Optional[str]:
         "Strength saving throw" -> "Strength"
         "Wisdom save" -> "Wisdom"
     """
-    abilities = ['Strength', 'Dexterity', 'Constitution', 'Intelligence', 'Wisdom', 'Charisma']
-
-    for ability in abilities:
-        # Look for "Ability saving throw" or "Ability save"
-        if re.search(rf'\b{ability}\s+sav(?:ing throw|e)\b', text, re.IGNORECASE):
+    # Look for "Ability saving throw" or "Ability save" in one scan; if
+    # several abilities appear, the first in _SAVE_ABILITIES order wins
+    found = {match.group(1).casefold() for match in _SAVE_ABILITY_RE.finditer(text)}
+    if not found:
+        return None
+
+    for ability in _SAVE_ABILITIES:
+        if ability.casefold() in found:
             return ability
 
     return None
@@ -90,12 +106,12 @@ def extract_duration(text: str) -> Optional[str]:
         "for 1 hour" -> "1 hour"
     """
     # Pattern: "for X time-unit"
-    match = re.search(r'for (\d+\s+(?:round|minute|hour|day)s?)', text)
+    match = _DUR_FOR_RE.search(text)
     if match:
         return match.group(1)
 
     # Pattern: "until X"
-    match = re.search(r'until ([^.;,]+?)(?:[.;,]|$)', text)
+    match = _DUR_UNTIL_RE.search(text)
     if match:
         duration = match.group(1).strip()
         if len(duration) < 80:  # Reasonable duration text length
@@ -138,15 +154,26 @@ def extract_conditions_from_text(text: str) -> List[Dict[str, Any]]:
 
     Returns list of condition extractions with context.
     """
-    if not isinstance(text, str):
+    # Literal prescreen: most entry strings are plain flavor text, and a
+    # substring test rejects them faster than starting a regex scan
+    if not isinstance(text, str) or '{@condition ' not in text:
         return []
 
     results = []
 
-    # Find all {@condition name|source} tags
-    pattern = r'\{@condition ([^}|]+)(?:\|([^}]+))?\}'
+    # One pass over the whole text for the substrings the context searches
+    # need: a search that cannot match anywhere in text cannot match in
+    # any window of it, so it is skipped for every condition
+    has_dc = '{@dc ' in text or 'DC ' in text
+    has_save = 'sav' in text.casefold()
+    has_duration = 'for ' in text or 'until ' in text
+
+    # Context results per (start, end) window; conditions close together
+    # in a short text share a window
+    contexts = {}
 
-    for match in re.finditer(pattern, text):
+    # Find all {@condition name|source} tags
+    for match in _CONDITION_TAG_RE.finditer(text):
         condition_name = match.group(1).strip()
         condition_source = match.group(2).strip() if match.group(2) else None
 
@@ -160,11 +187,16 @@ def extract_conditions_from_text(text: str) -> List[Dict[str, Any]]:
         # Look within 200 characters before and after the condition
         context_start = max(0, match.start() - 200)
         context_end = min(len(text), match.end() + 200)
-        context_text = text[context_start:context_end]
-
-        dc = extract_dc(context_text)
-        save_ability = extract_save_ability(context_text)
-        duration = extract_duration(context_text)
+        window = (context_start, context_end)
+        context = contexts.get(window)
+        if context is None:
+            context_text = text[context_start:context_end]
+            context = contexts[window] = (
+                extract_dc(context_text) if has_dc else None,
+                extract_save_ability(context_text) if has_save else None,
+                extract_duration(context_text) if has_duration else None,
+            )
+        dc, save_ability, duration = context
 
         results.append({
             'condition': condition_name,
@@ -202,94 +234,104 @@ def extract_from_entries(entries: Any) -> List[str]:
     return texts
 
 
-def extract_item_conditions(items: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
-    """Extract conditions from items."""
+def _item_conditions(item: Dict[str, Any]) -> List[Dict[str, Any]]:
+    """Extract conditions from one item."""
     results = []
-
-    for item in items:
-        item_name = item.get('name', 'Unknown')
-        source = item.get('source', 'Unknown')
-
-        # Check entries field
-        if 'entries' in item:
-            texts = extract_from_entries(item['entries'])
-            for text in texts:
-                conditions = extract_conditions_from_text(text)
-                for cond in conditions:
-                    results.append({
-                        'item_name': item_name,
-                        'source': source,
-                        'context': 'entries',
-                        'context_name': None,
-                        **cond
-                    })
+    item_name = item.get('name', 'Unknown')
+    source = item.get('source', 'Unknown')
+
+    # Check entries field
+    if 'entries' in item:
+        texts = extract_from_entries(item['entries'])
+        for text in texts:
+            conditions = extract_conditions_from_text(text)
+            for cond in conditions:
+                results.append({
+                    'item_name': item_name,
+                    'source': source,
+                    'context': 'entries',
+                    'context_name': None,
+                    **cond
+                })
 
     return results
 
 
-def extract_monster_conditions(monsters: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
-    """Extract conditions from monsters."""
-    results = []
+def extract_item_conditions(items: Iterable[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    """Extract conditions from items."""
+    return [row for rows in map_records(_item_conditions, items) for row in rows]
 
-    for monster in monsters:
-        monster_name = monster.get('name', 'Unknown')
-        source = monster.get('source', 'Unknown')
-
-        # Check various fields that can contain conditions
-        fields_to_check = [
-            ('trait', 'trait'),
-            ('action', 'action'),
-            ('bonus', 'bonus action'),
-            ('reaction', 'reaction'),
-            ('legendary', 'legendary action')
-        ]
-
-        for field_name, context_type in fields_to_check:
-            if field_name in monster:
-                for ability in monster[field_name]:
-                    ability_name = ability.get('name', 'Unknown')
-
-                    if 'entries' in ability:
-                        texts = extract_from_entries(ability['entries'])
-                        for text in texts:
-                            conditions = extract_conditions_from_text(text)
-                            for cond in conditions:
-                                results.append({
-                                    'monster_name': monster_name,
-                                    'source': source,
-                                    'context': context_type,
-                                    'context_name': ability_name,
-                                    **cond
-                                })
 
-    return results
+# Monster fields that can contain conditions, with their context type
+_MONSTER_CONDITION_FIELDS = [
+    ('trait', 'trait'),
+    ('action', 'action'),
+    ('bonus', 'bonus action'),
+    ('reaction', 'reaction'),
+    ('legendary', 'legendary action')
+]
 
 
-def extract_spell_conditions(spells: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
-    """Extract conditions from spells."""
+def _monster_conditions(monster: Dict[str, Any]) -> List[Dict[str, Any]]:
+    """Extract conditions from one monster."""
     results = []
+    monster_name = monster.get('name', 'Unknown')
+    source = monster.get('source', 'Unknown')
+
+    for field_name, context_type in _MONSTER_CONDITION_FIELDS:
+        if field_name in monster:
+            for ability in monster[field_name]:
+                ability_name = ability.get('name', 'Unknown')
+
+                if 'entries' in ability:
+                    texts = extract_from_entries(ability['entries'])
+                    for text in texts:
+                        conditions = extract_conditions_from_text(text)
+                        for cond in conditions:
+                            results.append({
+                                'monster_name': monster_name,
+                                'source': source,
+                                'context': context_type,
+                                'context_name': ability_name,
+                                **cond
+                            })
+
+    return results
+
+
+def extract_monster_conditions(monsters: Iterable[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    """Extract conditions from monsters."""
+    return [row for rows in map_records(_monster_conditions, monsters) for row in rows]
+
 
-    for spell in spells:
-        spell_name = spell.get('name', 'Unknown')
-        source = spell.get('source', 'Unknown')
-
-        # Check entries field
-        if 'entries' in spell:
-            texts = extract_from_entries(spell['entries'])
-            for text in texts:
-                conditions = extract_conditions_from_text(text)
-                for cond in conditions:
-                    results.append({
-                        'spell_name': spell_name,
-                        'source': source,
-                        'context': 'entries',
-                        'context_name': None,
-                        **cond
-                    })
+def _spell_conditions(spell: Dict[str, Any]) -> List[Dict[str, Any]]:
+    """Extract conditions from one spell."""
+    results = []
+    spell_name = spell.get('name', 'Unknown')
+    source = spell.get('source', 'Unknown')
+
+    # Check entries field
+    if 'entries' in spell:
+        texts = extract_from_entries(spell['entries'])
+        for text in texts:
+            conditions = extract_conditions_from_text(text)
+            for cond in conditions:
+                results.append({
+                    'spell_name': spell_name,
+                    'source': source,
+                    'context': 'entries',
+                    'context_name': None,
+                    **cond
+                })
 
     return results
 
 
+def extract_spell_conditions(spells: Iterable[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    """Extract conditions from spells."""
+    return [row for rows in map_records(_spell_conditions, spells) for row in rows]
+
+
 def main():
     """Main extraction process."""
     print("=" * 60)
@@ -304,11 +346,10 @@ def main():
     # Extract from items
     print("\n[1/3] Extracting conditions from items...")
     items_path = cleaned_dir / "items_extracted.json"
-    with open(items_path) as f:
-        items = json.load(f)
-
-    print(f"  Loaded {len(items)} items")
+    # Stream records straight into extraction; counted as they go
+    items = CountedRecords(iter_records(items_path))
     item_conditions = extract_item_conditions(items)
+    print(f"  Loaded {items.count} items")
     print(f"  Found {len(item_conditions)} condition references")
 
     # Show sample
@@ -323,11 +364,10 @@ def main():
     # Extract from monsters
     print("\n[2/3] Extracting conditions from monsters...")
     monsters_path = cleaned_dir / "monsters_extracted.json"
-    with open(monsters_path) as f:
-        monsters = json.load(f)
-
-    print(f"  Loaded {len(monsters)} monsters")
+    # Stream records straight into extraction; counted as they go
+    monsters = CountedRecords(iter_records(monsters_path))
     monster_conditions = extract_monster_conditions(monsters)
+    print(f"  Loaded {monsters.count} monsters")
     print(f"  Found {len(monster_conditions)} condition references")
 
     # Show sample
@@ -342,11 +382,10 @@ def main():
     # Extract from spells
     print("\n[3/3] Extracting conditions from spells...")
     spells_path = cleaned_dir / "spells_extracted.json"
-    with open(spells_path) as f:
-        spells = json.load(f)
-
-    print(f"  Loaded {len(spells)} spells")
+    # Stream records straight into extraction; counted as they go
+    spells = CountedRecords(iter_records(spells_path))
     spell_conditions = extract_spell_conditions(spells)
+    print(f"  Loaded {spells.count} spells")
     print(f"  Found {len(spell_conditions)} condition references")
 
     # Show sample
@@ -366,8 +405,7 @@ def main():
     }
 
     output_path = output_dir / "conditions_extracted.json"
-    with open(output_path, 'w') as f:
-        json.dump(output_data, f, indent=2)
+    dump_json(output_data, output_path)
 
     print(f"\n  ✓ Saved to {output_path}")
 
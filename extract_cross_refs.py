@@ -36,12 +36,22 @@ Format:
 }
 """
 
-import json
 import re
-from typing import Dict, Any, List, Optional, Tuple
+from typing import Dict, Any, Iterable, List, Optional, Tuple
 from pathlib import Path
 from collections import defaultdict
 
+from json_helpers import CountedRecords, dump_json, iter_records, map_records
+
+
+# {@item|spell|creature name|source} tags, all found in one scan
+_REF_TAG_RE = re.compile(r'\{@(item|spell|creature) ([^|}]+)(?:\|([^}]+))?\}')
+
+# Item relationship keywords. A trailing 's' never matters to the
+# "name ... keyword" / "keyword ... name" checks, so it is left off.
+_REQUIRES_RE = re.compile(r'require|need|use', re.IGNORECASE)
+_CONTAINS_RE = re.compile(r'contain|include|comes with', re.IGNORECASE)
+
 
 def extract_from_entries(entries: Any) -> List[str]:
     """Extract text from entries field (string, list, or nested structure)."""
@@ -62,68 +72,153 @@ def extract_from_entries(entries: Any) -> List[str]:
     return texts
 
 
-def extract_item_references(items: List[Dict[str, Any]]) -> Dict[str, List[Dict[str, Any]]]:
+def _walk_strings(obj: Any):
+    """Yield every string value in a nested dict/list structure, in document order."""
+    stack = [obj]
+    while stack:
+        value = stack.pop()
+        if isinstance(value, str):
+            yield value
+        elif isinstance(value, dict):
+            stack.extend(reversed(list(value.values())))
+        elif isinstance(value, list):
+            stack.extend(reversed(value))
+
+
+def _find_tag_refs(text: str) -> Tuple[List[Tuple[str, str]], List[Tuple[str, str]], List[Tuple[str, str]]]:
     """
-    Extract cross-references from items.
+    Find the {@item}, {@spell} and {@creature} tags in text with a single scan.
 
     Returns:
-        - item_to_item: Items that reference other items
-        - item_to_spell: Items that reference spells
-        - item_to_creature: Items that reference creatures
+        (item refs, spell refs, creature refs), each a list of
+        (name, source) in text order; source is '' when the tag has none
     """
-    item_to_item = []
-    item_to_spell = []
-    item_to_creature = []
+    refs = {'item': [], 'spell': [], 'creature': []}
+    # Literal prescreen: skip the regex for text with no tags at all
+    if '{@' not in text:
+        return refs['item'], refs['spell'], refs['creature']
+    for kind, name, source in _REF_TAG_RE.findall(text):
+        refs[kind].append((name, source))
+    return refs['item'], refs['spell'], refs['creature']
 
-    for item in items:
-        item_name = item.get('name', 'Unknown')
-        source = item.get('source', 'Unknown')
 
-        if 'entries' not in item:
-            continue
+def _relationship_keywords(full_text: str) -> List[Tuple[str, int, Optional[int]]]:
+    """
+    Locate the relationship keywords in each line of an item's text.
 
-        texts = extract_from_entries(item['entries'])
-        full_text = ' '.join(texts)
+    Returns:
+        (line, start of the last requires keyword or -1,
+        end of the first contains keyword or None) for each line
+    """
+    lines = []
+    for line in full_text.split('\n'):
+        last_requires = -1
+        for match in _REQUIRES_RE.finditer(line):
+            last_requires = match.start()
+        contains = _CONTAINS_RE.search(line)
+        lines.append((line, last_requires, contains.end() if contains else None))
+    return lines
 
-        # Find {@item} references
-        item_refs = re.findall(r'\{@item ([^|}]+)(?:\|([^}]+))?\}', full_text)
-        for ref_name, ref_source in item_refs:
-            # Try to determine relationship type from context
-            relationship_type = 'references'
 
-            # Common relationship patterns
-            if re.search(rf'{re.escape(ref_name)}.*(?:requires?|needs?|uses?)', full_text, re.IGNORECASE):
-                relationship_type = 'requires'
-            elif re.search(rf'(?:contains?|includes?|comes with).*{re.escape(ref_name)}', full_text, re.IGNORECASE):
-                relationship_type = 'contains'
+def _relationship_type(ref_name: str, keyword_lines: List[Tuple[str, int, Optional[int]]]) -> str:
+    """
+    Classify an item reference from _relationship_keywords output.
 
-            item_to_item.append({
-                'from_item': item_name,
-                'from_source': source,
-                'to_item': ref_name,
-                'to_source': ref_source if ref_source else None,
-                'relationship_type': relationship_type
-            })
+    'requires' if the name appears before a requires/needs/uses keyword on
+    the same line, else 'contains' if it appears after a contains/includes/
+    "comes with" keyword, else 'references'. One search per line instead of
+    backtracking "name.*keyword" regexes over the whole text.
+    """
+    name_re = re.compile(re.escape(ref_name), re.IGNORECASE)
 
-        # Find {@spell} references
-        spell_refs = re.findall(r'\{@spell ([^|}]+)(?:\|([^}]+))?\}', full_text)
-        for ref_name, ref_source in spell_refs:
-            item_to_spell.append({
-                'item_name': item_name,
-                'item_source': source,
-                'spell_name': ref_name,
-                'spell_source': ref_source if ref_source else None
-            })
+    for line, last_requires, _ in keyword_lines:
+        if last_requires >= 0:
+            match = name_re.search(line)
+            if match and match.end() <= last_requires:
+                return 'requires'
 
-        # Find {@creature} references
-        creature_refs = re.findall(r'\{@creature ([^|}]+)(?:\|([^}]+))?\}', full_text)
-        for ref_name, ref_source in creature_refs:
-            item_to_creature.append({
-                'item_name': item_name,
-                'item_source': source,
-                'creature_name': ref_name,
-                'creature_source': ref_source if ref_source else None
-            })
+    for line, _, contains_end in keyword_lines:
+        if contains_end is not None and name_re.search(line, contains_end):
+            return 'contains'
+
+    return 'references'
+
+
+def _concat_outputs(func, records: Iterable[Dict[str, Any]], n_lists: int) -> Tuple[List[Dict[str, Any]], ...]:
+    """
+    Apply a per-record extractor returning n_lists row lists to every record.
+
+    Records go through map_records; each of the n_lists outputs is
+    concatenated in record order.
+    """
+    outputs = tuple([] for _ in range(n_lists))
+    for rows in map_records(func, records):
+        for output, part in zip(outputs, rows):
+            output.extend(part)
+    return outputs
+
+
+def _item_references(item: Dict[str, Any]) -> Tuple[List[Dict[str, Any]], ...]:
+    """Extract (item_to_item, item_to_spell, item_to_creature) rows for one item."""
+    item_to_item = []
+    item_to_spell = []
+    item_to_creature = []
+
+    item_name = item.get('name', 'Unknown')
+    source = item.get('source', 'Unknown')
+
+    if 'entries' not in item:
+        return item_to_item, item_to_spell, item_to_creature
+
+    texts = extract_from_entries(item['entries'])
+    full_text = ' '.join(texts)
+
+    # Find {@item}, {@spell} and {@creature} references in one scan
+    item_refs, spell_refs, creature_refs = _find_tag_refs(full_text)
+    keyword_lines = _relationship_keywords(full_text) if item_refs else None
+    for ref_name, ref_source in item_refs:
+        # Try to determine relationship type from context
+        relationship_type = _relationship_type(ref_name, keyword_lines)
+
+        item_to_item.append({
+            'from_item': item_name,
+            'from_source': source,
+            'to_item': ref_name,
+            'to_source': ref_source if ref_source else None,
+            'relationship_type': relationship_type
+        })
+
+    # Find {@spell} references
+    for ref_name, ref_source in spell_refs:
+        item_to_spell.append({
+            'item_name': item_name,
+            'item_source': source,
+            'spell_name': ref_name,
+            'spell_source': ref_source if ref_source else None
+        })
+
+    # Find {@creature} references
+    for ref_name, ref_source in creature_refs:
+        item_to_creature.append({
+            'item_name': item_name,
+            'item_source': source,
+            'creature_name': ref_name,
+            'creature_source': ref_source if ref_source else None
+        })
+
+    return item_to_item, item_to_spell, item_to_creature
+
+
+def extract_item_references(items: Iterable[Dict[str, Any]]) -> Dict[str, List[Dict[str, Any]]]:
+    """
+    Extract cross-references from items.
+
+    Returns:
+        - item_to_item: Items that reference other items
+        - item_to_spell: Items that reference spells
+        - item_to_creature: Items that reference creatures
+    """
+    item_to_item, item_to_spell, item_to_creature = _concat_outputs(_item_references, items, 3)
 
     return {
         'item_to_item': item_to_item,
@@ -132,7 +227,68 @@ def extract_item_references(items: List[Dict[str, Any]]) -> Dict[str, List[Dict[
     }
 
 
-def extract_monster_references(monsters: List[Dict[str, Any]]) -> Dict[str, List[Dict[str, Any]]]:
+def _monster_references(monster: Dict[str, Any]) -> Tuple[List[Dict[str, Any]], ...]:
+    """Extract (monster_to_item, monster_to_spell, monster_to_creature) rows for one monster."""
+    monster_to_item = []
+    monster_to_spell = []
+    monster_to_creature = []
+
+    monster_name = monster.get('name', 'Unknown')
+    source = monster.get('source', 'Unknown')
+
+    # Check all text fields: their string values joined in document
+    # order (repr'ing the whole dict cost far more and escaped quotes
+    # inside tag names)
+    all_text = ' '.join(_walk_strings(monster))
+
+    # Find {@item}, {@spell} and {@creature} references in one scan
+    item_refs, spell_refs, creature_refs = _find_tag_refs(all_text)
+    for ref_name, ref_source in item_refs:
+        monster_to_item.append({
+            'monster_name': monster_name,
+            'monster_source': source,
+            'item_name': ref_name,
+            'item_source': ref_source if ref_source else None
+        })
+
+    # Find {@spell} references (often in spellcasting traits)
+    for ref_name, ref_source in spell_refs:
+        # Try to extract frequency/usage from context
+        frequency = None
+
+        # Look for patterns like "1/day", "at will", "3/day"
+        context_match = re.search(
+            rf'({ref_name}.*?(?:at will|\d+/day|recharge))',
+            all_text,
+            re.IGNORECASE | re.DOTALL
+        )
+        if context_match:
+            context = context_match.group(1)
+            freq_match = re.search(r'(\d+)/day|at will|recharge', context, re.IGNORECASE)
+            if freq_match:
+                frequency = freq_match.group(0).lower()
+
+        monster_to_spell.append({
+            'monster_name': monster_name,
+            'monster_source': source,
+            'spell_name': ref_name,
+            'spell_source': ref_source if ref_source else None,
+            'frequency': frequency
+        })
+
+    # Find {@creature} references
+    for ref_name, ref_source in creature_refs:
+        monster_to_creature.append({
+            'monster_name': monster_name,
+            'monster_source': source,
+            'creature_name': ref_name,
+            'creature_source': ref_source if ref_source else None
+        })
+
+    return monster_to_item, monster_to_spell, monster_to_creature
+
+
+def extract_monster_references(monsters: Iterable[Dict[str, Any]]) -> Dict[str, List[Dict[str, Any]]]:
     """
     Extract cross-references from monsters.
 
@@ -141,62 +297,7 @@ def extract_monster_references(monsters: List[Dict[str, Any]]) -> Dict[str, List
         - monster_to_spell: Monsters that can cast spells
         - monster_to_creature: Monsters that reference other creatures
     """
-    monster_to_item = []
-    monster_to_spell = []
-    monster_to_creature = []
-
-    for monster in monsters:
-        monster_name = monster.get('name', 'Unknown')
-        source = monster.get('source', 'Unknown')
-
-        # Check all text fields
-        all_text = str(monster)
-
-        # Find {@item} references
-        item_refs = re.findall(r'\{@item ([^|}]+)(?:\|([^}]+))?\}', all_text)
-        for ref_name, ref_source in item_refs:
-            monster_to_item.append({
-                'monster_name': monster_name,
-                'monster_source': source,
-                'item_name': ref_name,
-                'item_source': ref_source if ref_source else None
-            })
-
-        # Find {@spell} references (often in spellcasting traits)
-        spell_refs = re.findall(r'\{@spell ([^|}]+)(?:\|([^}]+))?\}', all_text)
-        for ref_name, ref_source in spell_refs:
-            # Try to extract frequency/usage from context
-            frequency = None
-
-            # Look for patterns like "1/day", "at will", "3/day"
-            context_match = re.search(
-                rf'({ref_name}.*?(?:at will|\d+/day|recharge))',
-                all_text,
-                re.IGNORECASE
-            )
-            if context_match:
-                context = context_match.group(1)
-                freq_match = re.search(r'(\d+)/day|at will|recharge', context, re.IGNORECASE)
-                if freq_match:
-                    frequency = freq_match.group(0).lower()
-
-            monster_to_spell.append({
-                'monster_name': monster_name,
-                'monster_source': source,
-                'spell_name': ref_name,
-                'spell_source': ref_source if ref_source else None,
-                'frequency': frequency
-            })
-
-        # Find {@creature} references
-        creature_refs = re.findall(r'\{@creature ([^|}]+)(?:\|([^}]+))?\}', all_text)
-        for ref_name, ref_source in creature_refs:
-            monster_to_creature.append({
-                'monster_name': monster_name,
-                'monster_source': source,
-                'creature_name': ref_name,
-                'creature_source': ref_source if ref_source else None
-            })
+    monster_to_item, monster_to_spell, monster_to_creature = _concat_outputs(_monster_references, monsters, 3)
 
     return {
         'monster_to_item': monster_to_item,
@@ -205,7 +306,73 @@ def extract_monster_references(monsters: List[Dict[str, Any]]) -> Dict[str, List
     }
 
 
-def extract_spell_references(spells: List[Dict[str, Any]]) -> Dict[str, List[Dict[str, Any]]]:
+def _spell_references(spell: Dict[str, Any]) -> Tuple[List[Dict[str, Any]], ...]:
+    """Extract (spell_to_item, spell_to_spell, spell_summons) rows for one spell."""
+    spell_to_item = []
+    spell_to_spell = []
+    spell_summons = []
+
+    spell_name = spell.get('name', 'Unknown')
+    source = spell.get('source', 'Unknown')
+    spell_level = spell.get('level', 0)
+
+    if 'entries' not in spell:
+        return spell_to_item, spell_to_spell, spell_summons
+
+    texts = extract_from_entries(spell['entries'])
+    full_text = ' '.join(texts)
+
+    # Find {@item}, {@spell} and {@creature} references in one scan
+    item_refs, spell_refs, creature_refs = _find_tag_refs(full_text)
+    for ref_name, ref_source in item_refs:
+        spell_to_item.append({
+            'spell_name': spell_name,
+            'spell_source': source,
+            'spell_level': spell_level,
+            'item_name': ref_name,
+            'item_source': ref_source if ref_source else None
+        })
+
+    # Find {@spell} references
+    for ref_name, ref_source in spell_refs:
+        # Don't include self-references
+        if ref_name.lower() != spell_name.lower():
+            spell_to_spell.append({
+                'from_spell': spell_name,
+                'from_source': source,
+                'to_spell': ref_name,
+                'to_source': ref_source if ref_source else None
+            })
+
+    # Find {@creature} references (summons)
+    for ref_name, ref_source in creature_refs:
+        # Try to determine if it's a summon
+        is_summon = False
+        quantity = None
+
+        # Look for summon keywords
+        if re.search(r'summons?|conjures?|creates?|animates?', full_text, re.IGNORECASE):
+            is_summon = True
+
+            # Try to extract quantity
+            qty_match = re.search(rf'(\d+)\s+{re.escape(ref_name)}', full_text, re.IGNORECASE)
+            if qty_match:
+                quantity = int(qty_match.group(1))
+
+        spell_summons.append({
+            'spell_name': spell_name,
+            'spell_source': source,
+            'spell_level': spell_level,
+            'creature_name': ref_name,
+            'creature_source': ref_source if ref_source else None,
+            'is_summon': is_summon,
+            'quantity': quantity
+        })
+
+    return spell_to_item, spell_to_spell, spell_summons
+
+
+def extract_spell_references(spells: Iterable[Dict[str, Any]]) -> Dict[str, List[Dict[str, Any]]]:
     """
     Extract cross-references from spells.
 
@@ -214,69 +381,7 @@ def extract_spell_references(spells: List[Dict[str, Any]]) -> Dict[str, List[Dic
         - spell_to_spell: Spells that reference other spells
         - spell_summons: Spells that summon creatures
     """
-    spell_to_item = []
-    spell_to_spell = []
-    spell_summons = []
-
-    for spell in spells:
-        spell_name = spell.get('name', 'Unknown')
-        source = spell.get('source', 'Unknown')
-        spell_level = spell.get('level', 0)
-
-        if 'entries' not in spell:
-            continue
-
-        texts = extract_from_entries(spell['entries'])
-        full_text = ' '.join(texts)
-
-        # Find {@item} references
-        item_refs = re.findall(r'\{@item ([^|}]+)(?:\|([^}]+))?\}', full_text)
-        for ref_name, ref_source in item_refs:
-            spell_to_item.append({
-                'spell_name': spell_name,
-                'spell_source': source,
-                'spell_level': spell_level,
-                'item_name': ref_name,
-                'item_source': ref_source if ref_source else None
-            })
-
-        # Find {@spell} references
-        spell_refs = re.findall(r'\{@spell ([^|}]+)(?:\|([^}]+))?\}', full_text)
-        for ref_name, ref_source in spell_refs:
-            # Don't include self-references
-            if ref_name.lower() != spell_name.lower():
-                spell_to_spell.append({
-                    'from_spell': spell_name,
-                    'from_source': source,
-                    'to_spell': ref_name,
-                    'to_source': ref_source if ref_source else None
-                })
-
-        # Find {@creature} references (summons)
-        creature_refs = re.findall(r'\{@creature ([^|}]+)(?:\|([^}]+))?\}', full_text)
-        for ref_name, ref_source in creature_refs:
-            # Try to determine if it's a summon
-            is_summon = False
-            quantity = None
-
-            # Look for summon keywords
-            if re.search(r'summons?|conjures?|creates?|animates?', full_text, re.IGNORECASE):
-                is_summon = True
-
-                # Try to extract quantity
-                qty_match = re.search(rf'(\d+)\s+{re.escape(ref_name)}', full_text, re.IGNORECASE)
-                if qty_match:
-                    quantity = int(qty_match.group(1))
-
-            spell_summons.append({
-                'spell_name': spell_name,
-                'spell_source': source,
-                'spell_level': spell_level,
-                'creature_name': ref_name,
-                'creature_source': ref_source if ref_source else None,
-                'is_summon': is_summon,
-                'quantity': quantity
-            })
+    spell_to_item, spell_to_spell, spell_summons = _concat_outputs(_spell_references, spells, 3)
 
     return {
         'spell_to_item': spell_to_item,
@@ -299,11 +404,10 @@ def main():
     # Extract from items
     print("\n[1/3] Extracting cross-references from items...")
     items_path = cleaned_dir / "items_extracted.json"
-    with open(items_path) as f:
-        items = json.load(f)
-
-    print(f"  Loaded {len(items)} items")
+    # Stream records straight into extraction; counted as they go
+    items = CountedRecords(iter_records(items_path))
     item_refs = extract_item_references(items)
+    print(f"  Loaded {items.count} items")
 
     print(f"  Found {len(item_refs['item_to_item'])} item→item references")
     print(f"  Found {len(item_refs['item_to_spell'])} item→spell references")
@@ -312,11 +416,10 @@ def main():
     # Extract from monsters
     print("\n[2/3] Extracting cross-references from monsters...")
     monsters_path = cleaned_dir / "monsters_extracted.json"
-    with open(monsters_path) as f:
-        monsters = json.load(f)
-
-    print(f"  Loaded {len(monsters)} monsters")
+    # Stream records straight into extraction; counted as they go
+    monsters = CountedRecords(iter_records(monsters_path))
     monster_refs = extract_monster_references(monsters)
+    print(f"  Loaded {monsters.count} monsters")
 
     print(f"  Found {len(monster_refs['monster_to_item'])} monster→item references")
     print(f"  Found {len(monster_refs['monster_to_spell'])} monster→spell references")
@@ -325,11 +428,10 @@ def main():
     # Extract from spells
     print("\n[3/3] Extracting cross-references from spells...")
     spells_path = cleaned_dir / "spells_extracted.json"
-    with open(spells_path) as f:
-        spells = json.load(f)
-
-    print(f"  Loaded {len(spells)} spells")
+    # Stream records straight into extraction; counted as they go
+    spells = CountedRecords(iter_records(spells_path))
     spell_refs = extract_spell_references(spells)
+    print(f"  Loaded {spells.count} spells")
 
     print(f"  Found {len(spell_refs['spell_to_item'])} spell→item references")
     print(f"  Found {len(spell_refs['spell_to_spell'])} spell→spell references")
@@ -358,8 +460,7 @@ def main():
     }
 
     output_path = output_dir / "cross_refs_extracted.json"
-    with open(output_path, 'w') as f:
-        json.dump(output_data, f, indent=2)
+    dump_json(output_data, output_path)
 
     print(f"\n  ✓ Saved to {output_path}")
 
@@ -25,6 +25,7 @@ from typing import Dict, Any, List, Optional
 sys.path.insert(0, str(Path(__file__).parent))
 from db_helpers import (
     get_connection,
+    return_connection,
     lookup_damage_type,
     lookup_condition_type,
     lookup_attack_type,
@@ -852,9 +853,9 @@ def main():
     print("\nSpell Summons:")
     stats_spell_summons.print_summary()
 
-    # Close connection
-    conn.close()
-    print("\n🔌 Database connection closed")
+    # Hand connection back to the pool
+    return_connection(conn)
+    print("\n🔌 Database connection released")
 
     # Exit with appropriate code
     total_failed = (stats_items_cond.failed + stats_monsters_cond.failed + stats_spells_cond.failed +
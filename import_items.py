@@ -15,18 +15,21 @@ Usage:
 import json
 import sys
 from pathlib import Path
-from typing import Dict, Any, List
+from typing import Dict, Any, List, Set, Tuple
 
 # Import helper functions
 sys.path.insert(0, str(Path(__file__).parent))
 from db_helpers import (
     get_connection,
+    return_connection,
+    discard_uncommitted_lookups,
     lookup_source,
     lookup_rarity,
     lookup_or_create_item_type,
     lookup_or_create_item_property,
+    create_missing_item_codes,
     clean_type_code,
-    log_progress,
+    ProgressLogger,
     log_warning,
     log_error,
     log_success,
@@ -47,6 +50,31 @@ def load_items() -> List[Dict[str, Any]]:
     return items
 
 
+def collect_item_codes(items: List[Dict[str, Any]]) -> Tuple[Set[str], Set[str]]:
+    """
+    Collect the cleaned type and property codes import_item will look up.
+
+    Returns:
+        (type codes, property codes)
+    """
+    type_codes = set()
+    property_codes = set()
+    for item in items:
+        raw_type = item.get('type')
+        if raw_type:
+            type_codes.add(clean_type_code(raw_type))
+
+        properties = item.get('property')
+        if properties:
+            if isinstance(properties, str):
+                properties = [properties]
+            property_codes.update(clean_type_code(code) for code in properties)
+
+    type_codes.discard(None)
+    property_codes.discard(None)
+    return type_codes, property_codes
+
+
 def import_item(conn, item: Dict[str, Any], stats: ImportStats) -> bool:
     """
     Import a single item into the database.
@@ -200,6 +228,7 @@ def import_item(conn, item: Dict[str, Any], stats: ImportStats) -> bool:
 
     except Exception as e:
         conn.rollback()
+        discard_uncommitted_lookups()
         stats.record_failure(f"{item.get('name', 'UNKNOWN')}: {str(e)}")
         return False
 
@@ -218,17 +247,23 @@ def main():
     conn = get_connection()
     print("✅ Database connection successful")
 
+    # Create any new type/property codes up front in one COPY each
+    type_codes, property_codes = collect_item_codes(items)
+    create_missing_item_codes(conn, 'item_types', type_codes)
+    create_missing_item_codes(conn, 'item_properties', property_codes)
+
     # Import items
     print(f"\n📥 Importing {len(items)} items...")
     stats = ImportStats()
 
-    for i, item in enumerate(items, 1):
+    progress = ProgressLogger(len(items), "items")
+    for item in items:
         import_item(conn, item, stats)
-        log_progress(i, len(items), "items")
+        progress.tick()
 
-    # Close connection
-    conn.close()
-    print("\n🔌 Database connection closed")
+    # Hand connection back to the pool
+    return_connection(conn)
+    print("\n🔌 Database connection released")
 
     # Print summary
     stats.print_summary()
@@ -21,6 +21,8 @@ from typing import Dict, Any, List
 sys.path.insert(0, str(Path(__file__).parent))
 from db_helpers import (
     get_connection,
+    return_connection,
+    discard_uncommitted_lookups,
     lookup_source,
     lookup_or_create_creature_type,
     lookup_or_create_creature_size,
@@ -30,7 +32,7 @@ from db_helpers import (
     parse_ac,
     parse_speed,
     parse_ability_scores,
-    log_progress,
+    ProgressLogger,
     log_warning,
     log_error,
     log_success,
@@ -176,6 +178,7 @@ def import_monster(conn, monster: Dict[str, Any], stats: ImportStats) -> bool:
 
     except Exception as e:
         conn.rollback()
+        discard_uncommitted_lookups()
         stats.record_failure(f"{monster.get('name', 'UNKNOWN')}: {str(e)}")
         return False
 
@@ -198,13 +201,14 @@ def main():
     print(f"\n📥 Importing {len(monsters)} monsters...")
     stats = ImportStats()
 
-    for i, monster in enumerate(monsters, 1):
+    progress = ProgressLogger(len(monsters), "monsters")
+    for monster in monsters:
         import_monster(conn, monster, stats)
-        log_progress(i, len(monsters), "monsters")
+        progress.tick()
 
-    # Close connection
-    conn.close()
-    print("\n🔌 Database connection closed")
+    # Hand connection back to the pool
+    return_connection(conn)
+    print("\n🔌 Database connection released")
 
     # Print summary
     stats.print_summary()
@@ -20,9 +20,10 @@ from typing import Dict, Any, List
 sys.path.insert(0, str(Path(__file__).parent))
 from db_helpers import (
     get_connection,
+    return_connection,
     lookup_source,
     lookup_spell_school,
-    log_progress,
+    ProgressLogger,
     log_warning,
     log_error,
     log_success,
@@ -252,13 +253,14 @@ def main():
     print(f"\n📥 Importing {len(spells)} spells...")
     stats = ImportStats()
 
-    for i, spell in enumerate(spells, 1):
+    progress = ProgressLogger(len(spells), "spells")
+    for spell in spells:
         import_spell(conn, spell, stats)
-        log_progress(i, len(spells), "spells")
+        progress.tick()
 
-    # Close connection
-    conn.close()
-    print("\n🔌 Database connection closed")
+    # Hand connection back to the pool
+    return_connection(conn)
+    print("\n🔌 Database connection released")
 
     # Print summary
     stats.print_summary()
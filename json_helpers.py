@@ -0,0 +1,286 @@
+#!/usr/bin/env python3
+"""
+JSON Helper Functions
+
+Shared JSON read/write utilities for the analysis and cleaning scripts.
+Parses with orjson over a read-only mmap so large bestiary files are
+not copied into the Python heap before parsing.
+
+Usage:
+    from json_helpers import load_json, dump_json, dump_json_records, prefetch_files
+    from json_helpers import encode_records, write_json_array, iter_records, count_array_items
+    from json_helpers import CountedRecords, map_records
+"""
+
+import mmap
+import os
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from itertools import islice
+from pathlib import Path
+from typing import Any, Dict, Iterable, Iterator, Optional
+
+import ijson
+import orjson
+
+
+def load_json(path: Path) -> Any:
+    """
+    Parse a JSON file via a read-only memory map.
+
+    Args:
+        path: Path to the JSON file
+
+    Returns:
+        Parsed JSON document
+    """
+    fd = os.open(path, os.O_RDONLY)
+    try:
+        # mmap rejects empty files; let orjson raise its usual decode error
+        if os.fstat(fd).st_size == 0:
+            return orjson.loads(b'')
+
+        with mmap.mmap(fd, 0, access=mmap.ACCESS_READ) as mm:
+            # orjson reads front to back: ask for aggressive readahead
+            if hasattr(mm, 'madvise'):
+                mm.madvise(mmap.MADV_SEQUENTIAL)
+            with memoryview(mm) as view:
+                return orjson.loads(view)
+    finally:
+        os.close(fd)
+
+
+# Files at least this large are streamed record by record by iter_records;
+# smaller ones are parsed whole, since orjson decodes about twice as fast
+# as ijson and one bestiary/items file is cheap to hold
+STREAM_THRESHOLD = 16 * 1024 * 1024
+
+
+def iter_records(path: Path, root_key: Optional[str] = None) -> Iterator[Any]:
+    """
+    Yield the records in a file's top-level root_key list.
+
+    Uses the fast whole-file orjson parse for ordinary files and falls
+    back to ijson streaming above STREAM_THRESHOLD to bound memory.
+    Yields nothing if root_key is missing or not a list.
+
+    Args:
+        path: Path to the JSON file
+        root_key: Top-level key holding the record list (e.g. 'monster'),
+            or None if the file itself is the list (cleaned_data output)
+    """
+    if os.path.getsize(path) >= STREAM_THRESHOLD:
+        prefix = f'{root_key}.item' if root_key is not None else 'item'
+        with open(path, 'rb') as f:
+            yield from ijson.items(f, prefix, use_float=True)
+        return
+
+    data = load_json(path)
+    if root_key is None:
+        records = data
+    else:
+        records = data.get(root_key) if type(data) is dict else None
+    if type(records) is list:
+        yield from records
+
+
+class CountedRecords:
+    """
+    Iterable over records that counts them as they are consumed.
+
+    Lets a single pass over iter_records() both process the records and
+    report how many there were, without materializing a list first.
+    """
+
+    __slots__ = ('records', 'count')
+
+    def __init__(self, records: Iterable[Any]):
+        self.records = records
+        self.count = 0
+
+    def __iter__(self) -> Iterator[Any]:
+        for record in self.records:
+            self.count += 1
+            yield record
+
+
+# Records handed to a worker at a time by map_records
+RECORD_CHUNKSIZE = 256
+
+
+def _map_chunk(func, chunk: list) -> list:
+    """Apply func to one chunk of records inside a worker process."""
+    return [func(record) for record in chunk]
+
+
+def map_records(func, records: Iterable[Any], chunksize: int = RECORD_CHUNKSIZE) -> Iterator[Any]:
+    """
+    Yield func(record) for every record, in record order, using all cores.
+
+    Only about two chunks per worker are in flight at once, so a streamed
+    iter_records() source is read as results are consumed rather than
+    being pulled into memory up front.
+
+    Args:
+        func: Picklable per-record function
+        records: Iterable of records
+        chunksize: Records handed to a worker at a time
+
+    Returns:
+        Iterator over func results
+    """
+    workers = os.cpu_count() or 1
+    if workers < 2:
+        yield from map(func, records)
+        return
+
+    records = iter(records)
+    with ProcessPoolExecutor() as executor:
+        pending = deque()
+        while True:
+            while len(pending) < 2 * workers:
+                chunk = list(islice(records, chunksize))
+                if not chunk:
+                    break
+                pending.append(executor.submit(_map_chunk, func, chunk))
+            if not pending:
+                return
+            yield from pending.popleft().result()
+
+
+def count_array_items(path: Path) -> Dict[str, int]:
+    """
+    Count the items in each top-level list of a JSON object file.
+
+    Ordinary files are parsed whole with orjson; above STREAM_THRESHOLD
+    the file is scanned with ijson's event parser instead, so only the
+    counts are ever held in memory. Keys whose values are not lists are
+    left out.
+
+    Args:
+        path: Path to a JSON file whose root is an object
+
+    Returns:
+        Mapping of top-level key to list length, in document order
+    """
+    if os.path.getsize(path) < STREAM_THRESHOLD:
+        data = load_json(path)
+        return {key: len(value) for key, value in data.items() if type(value) is list}
+
+    counts = {}
+    key = None
+    in_list = False  # whether the current top-level value is a list
+    depth = 0
+    with open(path, 'rb') as f:
+        for event, value in ijson.basic_parse(f):
+            if event == 'map_key':
+                if depth == 1:
+                    key = value
+                    in_list = False
+            elif event == 'start_map' or event == 'start_array':
+                if depth == 2:
+                    if in_list:
+                        counts[key] += 1
+                elif depth == 1 and event == 'start_array':
+                    counts[key] = 0
+                    in_list = True
+                depth += 1
+            elif event == 'end_map' or event == 'end_array':
+                depth -= 1
+            elif depth == 2 and in_list:
+                counts[key] += 1
+    return counts
+
+
+def prefetch_files(paths: Iterable[Path]):
+    """
+    Ask the kernel to start reading files into the page cache.
+
+    Returns immediately; readahead overlaps with whatever parsing runs
+    next, so later load_json/open calls find the pages already resident.
+    No-op on platforms without posix_fadvise.
+
+    Args:
+        paths: Files that are about to be read
+    """
+    if not hasattr(os, 'posix_fadvise'):
+        return
+
+    for path in paths:
+        try:
+            fd = os.open(path, os.O_RDONLY)
+        except OSError:
+            continue
+        try:
+            os.posix_fadvise(fd, 0, 0, os.POSIX_FADV_WILLNEED)
+        finally:
+            os.close(fd)
+
+
+def dump_json(obj: Any, path: Path):
+    """
+    Write obj to path as indented JSON.
+
+    Non-string dict keys (e.g. int/bool vocab values) are stringified,
+    matching the stdlib json.dump behaviour.
+
+    Args:
+        obj: JSON-serializable object
+        path: Output file path
+    """
+    with open(path, 'wb') as f:
+        f.write(orjson.dumps(obj, option=orjson.OPT_INDENT_2 | orjson.OPT_NON_STR_KEYS))
+
+
+def encode_records(records: Iterable[Any]) -> bytes:
+    """
+    Serialize records compactly, one per line, as a comma-separated array body.
+
+    The result is the body of a JSON array; pass one or more bodies to
+    write_json_array. Encoded bytes are far smaller than the dicts they
+    came from, so workers can return them cheaply.
+
+    Args:
+        records: JSON-serializable records
+
+    Returns:
+        Encoded array body (empty if there are no records)
+    """
+    dumps = orjson.dumps
+    option = orjson.OPT_NON_STR_KEYS
+    return b',\n'.join([dumps(record, option=option) for record in records])
+
+
+def write_json_array(bodies: Iterable[bytes], path: Path):
+    """
+    Write encode_records() bodies to path as a single JSON array.
+
+    Args:
+        bodies: Array bodies from encode_records, in output order
+        path: Output file path
+    """
+    with open(path, 'wb') as f:
+        f.write(b'[\n')
+        separator = b''
+        for body in bodies:
+            if body:
+                f.write(separator)
+                f.write(body)
+                separator = b',\n'
+        f.write(b'\n]\n')
+
+
+def dump_json_records(records: Iterable[Any], path: Path):
+    """
+    Write records to path as a JSON array with one compact record per line.
+
+    The file is still a plain JSON array (json.load/load_json read it
+    unchanged), but skips indentation, so it is smaller and faster to
+    write than dump_json output, and can be split per record line by
+    line-oriented tools.
+
+    Args:
+        records: JSON-serializable records
+        path: Output file path
+    """
+    write_json_array([encode_records(records)], path)
@@ -241,19 +241,9 @@ class PipelineOrchestrator:
         print("    Use --skip-analysis for normal pipeline runs")
         print()
 
-        scripts = [
-            "analyze_json_structure.py",
-            "analyze_field_types.py",
-            "analyze_controlled_vocab.py",
-            "analyze_relationships.py",
-        ]
-
-        for script in scripts:
-            result = self.run_script(script, "Phase 0: Analysis")
-            if result.status == PhaseStatus.FAILED:
-                return False
-
-        return True
+        # analyze_all.py runs all four analyzers with one parse per file
+        result = self.run_script("analyze_all.py", "Phase 0: Analysis")
+        return result.status != PhaseStatus.FAILED
 
     def run_phase_0_5(self) -> bool:
         """Phase 0.5: Data Cleaning & Normalization"""
@@ -0,0 +1,69 @@
+#!/usr/bin/env python3
+"""
+Script Helper Functions
+
+Shared subprocess handling for the pipeline orchestrators
+(clean_all.py, extract_all.py).
+
+Usage:
+    from script_helpers import run_scripts_parallel
+"""
+
+import subprocess
+import sys
+import time
+from pathlib import Path
+from typing import Iterable, Iterator, Tuple
+
+
+LOG_DIR = Path('logs')
+
+
+def run_scripts_parallel(script_names: Iterable[str], log_dir: Path = LOG_DIR) -> Iterator[Tuple[str, int, float, Path]]:
+    """
+    Run independent Python scripts concurrently.
+
+    Each script's output goes to <log_dir>/<script>.log so console output
+    doesn't interleave. If starting a script fails, or the caller stops
+    iterating early, scripts still running are terminated.
+
+    Args:
+        script_names: Scripts to start, all at once
+        log_dir: Directory for the per-script logs
+
+    Returns:
+        Iterator of (script_name, returncode, elapsed seconds, log path),
+        in the order the scripts finish
+    """
+    log_dir.mkdir(parents=True, exist_ok=True)
+
+    running = {}
+    try:
+        for script_name in script_names:
+            log_path = log_dir / f"{script_name}.log"
+            # The child inherits its own handle, so ours can close right away
+            with open(log_path, 'w') as log_file:
+                process = subprocess.Popen(
+                    [sys.executable, script_name],
+                    stdout=log_file,
+                    stderr=subprocess.STDOUT,
+                    text=True
+                )
+            running[script_name] = (process, log_path, time.time())
+
+        # Poll rather than wait() in order so each script's time is accurate
+        while running:
+            for script_name, (process, log_path, start_time) in list(running.items()):
+                if process.poll() is None:
+                    continue
+
+                del running[script_name]
+                yield script_name, process.returncode, time.time() - start_time, log_path
+
+            if running:
+                time.sleep(0.1)
+    finally:
+        for process, _, _ in running.values():
+            process.terminate()
+        for process, _, _ in running.values():
+            process.wait()
@@ -22,7 +22,7 @@ from pathlib import Path
 
 # Import helpers
 sys.path.insert(0, str(Path(__file__).parent))
-from db_helpers import get_connection
+from db_helpers import get_connection, return_connection
 
 
 @pytest.fixture(scope="session")
@@ -30,7 +30,7 @@ def db_connection():
     """Create a database connection for all tests"""
     conn = get_connection()
     yield conn
-    conn.close()
+    return_connection(conn)
 
 
 @pytest.fixture
@@ -6,6 +6,8 @@ import json
 from pathlib import Path
 from collections import defaultdict, Counter
 
+from json_helpers import load_json
+
 
 CLEANED_DIR = Path('cleaned_data')
 
@@ -87,8 +89,7 @@ def main():
     items_file = CLEANED_DIR / 'items.json'
     if items_file.exists():
         print("\n📦 Validating items...")
-        with open(items_file, 'r') as f:
-            items = json.load(f)
+        items = load_json(items_file)
 
         type_check = check_type_consistency(items, "items")
         validation_results["type_consistency"]["items"] = type_check
@@ -106,8 +107,7 @@ def main():
     monsters_file = CLEANED_DIR / 'monsters.json'
     if monsters_file.exists():
         print("\n🐉 Validating monsters...")
-        with open(monsters_file, 'r') as f:
-            monsters = json.load(f)
+        monsters = load_json(monsters_file)
 
         type_check = check_type_consistency(monsters, "monsters")
         validation_results["type_consistency"]["monsters"] = type_check
@@ -125,8 +125,7 @@ def main():
     spells_file = CLEANED_DIR / 'spells.json'
     if spells_file.exists():
         print("\n✨ Validating spells...")
-        with open(spells_file, 'r') as f:
-            spells = json.load(f)
+        spells = load_json(spells_file)
 
         type_check = check_type_consistency(spells, "spells")
         validation_results["type_consistency"]["spells"] = type_check
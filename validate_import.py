@@ -37,7 +37,7 @@ from psycopg2.extras import RealDictCursor
 
 # Import our existing helpers
 sys.path.insert(0, str(Path(__file__).parent))
-from db_helpers import get_connection, log_info, log_success, log_warning, log_error
+from db_helpers import get_connection, return_connection, log_info, log_success, log_warning, log_error
 
 
 class Severity(Enum):
@@ -689,7 +689,7 @@ def main():
         }
         print(json.dumps(json_result, indent=2))
 
-    conn.close()
+    return_connection(conn)
     return result.get_exit_code()
 
 